@@ -0,0 +1,42 @@
+"""Add tracks.source/external_id and their unique dedup index
+
+Revision ID: 001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all after the Track model gained these
+    # columns already have them, so every step is idempotent
+    op.execute("""
+        ALTER TABLE tracks
+            ADD COLUMN IF NOT EXISTS source VARCHAR(50),
+            ADD COLUMN IF NOT EXISTS external_id VARCHAR(255)
+    """)
+
+    # Building the index concurrently keeps tracks writable, but it can't
+    # run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS tracks_title_artist_uk")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS tracks_source_extid_uk "
+            "ON tracks (source, external_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS tracks_source_extid_uk")
+
+    op.drop_column('tracks', 'external_id')
+    op.drop_column('tracks', 'source')
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4, UUID
 from typing import Optional
-from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, JSON, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
@@ -25,6 +25,10 @@ class Track(Base):
     release_year = Column(Integer, nullable=True)
     isrc = Column(String(50), nullable=True)
 
+    # Origin of ingested tracks (e.g. 'FMA', 'Spotify') and their ID there
+    source = Column(String(50), nullable=True)
+    external_id = Column(String(255), nullable=True)
+
     audio_url = Column(Text, nullable=True)
     cover_url = Column(Text, nullable=True)
 
@@ -33,6 +37,10 @@ class Track(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("tracks_source_extid_uk", "source", "external_id", unique=True),
+    )
+
     # Relationships
     organization = relationship("Organization", back_populates="tracks")
     interactions = relationship("Interaction", back_populates="track")
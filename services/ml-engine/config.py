@@ -21,6 +21,16 @@ class ModelConfig(BaseModel):
     early_stopping_patience: int = 5
 
 
+class ALSConfig(ModelConfig):
+    backend: str = "implicit"  # "implicit" or "svd"
+    regularization: float = 0.01
+    iterations: int = 15
+    use_cg: bool = True
+    use_native: bool = True
+    use_gpu: bool = False
+    num_threads: int = 0  # 0 lets implicit use every core
+
+
 class Config:
     DATABASE_URL = os.getenv("DATABASE_URL")
     REDIS_URL = os.getenv("REDIS_URL")
@@ -31,7 +41,7 @@ class Config:
     FAISS_INDEX_PATH = "/models/faiss_indexes"
 
     FREE_MODELS = {
-        "collaborative_filter": ModelConfig(embedding_dim=64),
+        "collaborative_filter": ALSConfig(embedding_dim=64, use_gpu=ENABLE_GPU),
         "popularity": ModelConfig(),
         "genre_based": ModelConfig(),
     }
@@ -55,9 +65,17 @@ class Config:
 
     RECOMMENDATION_CACHE_TTL = 3600
     SIMILARITY_CACHE_TTL = 86400
+    READINESS_CACHE_TTL = 300
 
     FAISS_NLIST = 100
     FAISS_NPROBE = 10
+    FAISS_PQ_THRESHOLD = 100_000
+    FAISS_SQ_TYPE = os.getenv("FAISS_SQ_TYPE", "QT_fp16")
+    FAISS_GPU_TEMP_MEMORY_MB = 1024
+    FAISS_GPU_PINNED_MEMORY_MB = 256
+    FAISS_GPU_ADD_BATCH_SIZE = 100_000
+    FAISS_HNSW_EF_SEARCH = 64
+    FAISS_INDEX_MEMORY_BUDGET_MB = int(os.getenv("FAISS_INDEX_MEMORY_BUDGET_MB", "8192"))
 
     TRAINING_SCHEDULE = {
         "free": "0 4 * * *",
@@ -56,10 +56,10 @@ class RecommendationEngine:
             except Exception as e:
                 print(f"Failed to load content_based: {e}")
 
-        if os.path.exists(os.path.join(starter_path, "daily_mix.pkl")):
+        if os.path.exists(os.path.join(starter_path, "daily_mix.tracks.parquet")):
             try:
                 self.models['daily_mix'] = DailyMixGenerator.load(
-                    os.path.join(starter_path, "daily_mix.pkl")
+                    os.path.join(starter_path, "daily_mix")
                 )
             except Exception as e:
                 print(f"Failed to load daily_mix: {e}")
@@ -73,10 +73,10 @@ class RecommendationEngine:
             except Exception as e:
                 print(f"Failed to load neural_cf: {e}")
 
-        if os.path.exists(os.path.join(pro_path, "taste_profiler.pkl")):
+        if os.path.exists(os.path.join(pro_path, "taste_profiler.parquet")):
             try:
                 self.models['taste_profiler'] = TasteProfiler.load(
-                    os.path.join(pro_path, "taste_profiler.pkl")
+                    os.path.join(pro_path, "taste_profiler.parquet")
                 )
             except Exception as e:
                 print(f"Failed to load taste_profiler: {e}")
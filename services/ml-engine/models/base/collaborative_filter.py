@@ -1,11 +1,15 @@
 import torch
 import torch.nn as nn
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from uuid import UUID
 import numpy as np
 from scipy.sparse import csr_matrix
 from sklearn.decomposition import TruncatedSVD
 import pickle
+import logging
+
+
+logger = logging.getLogger("collaborative_filter")
 
 
 class CollaborativeFilter(nn.Module):
@@ -96,37 +100,90 @@ class CollaborativeFilter(nn.Module):
 
 
 class ALSCollaborativeFilter:
-    def __init__(self, factors: int = 64, regularization: float = 0.01, iterations: int = 15):
+    def __init__(
+        self,
+        factors: int = 64,
+        regularization: float = 0.01,
+        iterations: int = 15,
+        backend: str = "svd",
+        use_cg: bool = True,
+        use_native: bool = True,
+        use_gpu: bool = False,
+        num_threads: int = 0
+    ):
         self.factors = factors
         self.regularization = regularization
         self.iterations = iterations
+        self.backend = backend
+        self.use_cg = use_cg
+        self.use_native = use_native
+        self.use_gpu = use_gpu
+        self.num_threads = num_threads
         self.user_factors = None
         self.item_factors = None
         self.user_id_map = {}
         self.track_id_map = {}
 
-    def fit(self, interactions: List[Dict]):
-        user_ids = list(set([i['user_id'] for i in interactions]))
-        track_ids = list(set([i['track_id'] for i in interactions]))
+    def fit(self, interactions: List[Dict], id_codes: Optional[Tuple] = None):
+        # id_codes: optional (user_codes, track_codes, user_ids, track_ids)
+        # with int32 codes already aligned with interactions
+        if id_codes is not None:
+            rows, cols, user_ids, track_ids = id_codes
+        else:
+            user_ids = list(set([i['user_id'] for i in interactions]))
+            track_ids = list(set([i['track_id'] for i in interactions]))
 
         self.user_id_map = {uid: idx for idx, uid in enumerate(user_ids)}
         self.track_id_map = {tid: idx for idx, tid in enumerate(track_ids)}
 
-        rows = [self.user_id_map[i['user_id']] for i in interactions]
-        cols = [self.track_id_map[i['track_id']] for i in interactions]
+        if id_codes is None:
+            rows = [self.user_id_map[i['user_id']] for i in interactions]
+            cols = [self.track_id_map[i['track_id']] for i in interactions]
         data = [i.get('weight', 1.0) for i in interactions]
 
         interaction_matrix = csr_matrix(
             (data, (rows, cols)),
-            shape=(len(user_ids), len(track_ids))
+            shape=(len(user_ids), len(track_ids)),
+            dtype=np.float32
         )
 
-        svd = TruncatedSVD(n_components=self.factors, random_state=42)
-        self.user_factors = svd.fit_transform(interaction_matrix)
-        self.item_factors = svd.components_.T
+        if self.backend == "implicit":
+            self._fit_implicit(interaction_matrix)
+        else:
+            svd = TruncatedSVD(n_components=self.factors, random_state=42)
+            self.user_factors = svd.fit_transform(interaction_matrix)
+            self.item_factors = svd.components_.T
 
         return self
 
+    def _fit_implicit(self, interaction_matrix: csr_matrix):
+        import implicit.gpu
+        from implicit.als import AlternatingLeastSquares
+
+        # The PyPI wheels are CPU-only; implicit raises rather than falling back
+        use_gpu = self.use_gpu and implicit.gpu.HAS_CUDA
+        if self.use_gpu and not use_gpu:
+            logger.warning("implicit was built without CUDA support; training ALS on CPU")
+
+        # implicit picks its CUDA or Cython/OpenMP solver from use_gpu
+        model = AlternatingLeastSquares(
+            factors=self.factors,
+            regularization=self.regularization,
+            iterations=self.iterations,
+            use_native=self.use_native,
+            use_cg=self.use_cg,
+            use_gpu=use_gpu,
+            num_threads=self.num_threads,
+            random_state=42
+        )
+        model.fit(interaction_matrix, show_progress=False)
+
+        if use_gpu:
+            model = model.to_cpu()
+
+        self.user_factors = np.asarray(model.user_factors)
+        self.item_factors = np.asarray(model.item_factors)
+
     def recommend(self, user_id: UUID, k: int = 20) -> List[Tuple[UUID, float]]:
         if user_id not in self.user_id_map:
             return []
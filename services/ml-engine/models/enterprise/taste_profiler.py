@@ -1,14 +1,102 @@
 import numpy as np
-from typing import List, Dict
+import pandas as pd
+from typing import List, Dict, Optional, Tuple
 from uuid import UUID
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+import os
+
+
+_bulk_state = None
+
+AUDIO_PREFERENCE_FEATURES = ('tempo', 'energy', 'valence', 'danceability', 'acousticness')
+
+
+def _build_profile_chunk(user_ids: List[UUID]) -> List[Dict]:
+    profiler, interactions, tracks, audio_features = _bulk_state
+    return [
+        profiler.build_profile(user_id, interactions, tracks, audio_features)
+        for user_id in user_ids
+    ]
 
 
 class TasteProfiler:
     def __init__(self):
         self.user_profiles = {}
 
+        self._indexed_interactions = None
+        self._indexed_tracks = None
+        self._by_user = {}
+        self._interaction_types = np.empty(0, dtype=object)
+        self._track_ids = np.empty(0, dtype=object)
+        self._timestamps = np.empty(0, dtype='datetime64[s]')
+        self._genre_codes = np.empty(0, dtype=np.int16)
+        self._code_to_genre = []
+
+        self._indexed_audio_features = None
+        self._audio_matrix = np.empty((0, len(AUDIO_PREFERENCE_FEATURES)))
+
+    def index_interactions(
+        self,
+        interactions: List[Dict],
+        tracks: Optional[Dict[UUID, Dict]] = None
+    ):
+        now = datetime.utcnow()
+
+        user_ids = np.asarray([i['user_id'] for i in interactions], dtype=object)
+        unique_users, user_codes = np.unique(user_ids, return_inverse=True)
+        order = np.argsort(user_codes, kind='stable')
+        bounds = np.searchsorted(user_codes[order], np.arange(unique_users.size + 1))
+
+        self._by_user = {
+            user_id: slice(int(bounds[code]), int(bounds[code + 1]))
+            for code, user_id in enumerate(unique_users)
+        }
+        self._interaction_types = np.asarray(
+            [i['interaction_type'] for i in interactions], dtype=object
+        )[order]
+        self._track_ids = np.asarray([i['track_id'] for i in interactions], dtype=object)[order]
+        self._timestamps = np.asarray(
+            [i.get('timestamp', now) for i in interactions], dtype='datetime64[s]'
+        )[order]
+
+        tracks = tracks or {}
+        genres = pd.Categorical(
+            [(tracks.get(tid) or {}).get('genre') or None for tid in self._track_ids]
+        )
+        self._genre_codes = np.asarray(genres.codes)
+        self._code_to_genre = list(genres.categories)
+
+        self._indexed_interactions = interactions
+        self._indexed_tracks = tracks
+        self._indexed_audio_features = None
+
+        return self
+
+    def index_audio_features(self, audio_features: Dict[UUID, Dict]):
+        # One row of AUDIO_PREFERENCE_FEATURES per indexed interaction, NaN
+        # where a value is missing. Each distinct track is looked up once and
+        # the rows are gathered in a single take, so profiles only slice it.
+        unique_tids, inverse = np.unique(self._track_ids, return_inverse=True)
+        track_rows = np.full((unique_tids.size, len(AUDIO_PREFERENCE_FEATURES)), np.nan)
+
+        for row, tid in enumerate(unique_tids):
+            features = audio_features.get(tid)
+            if not features:
+                continue
+            for col, name in enumerate(AUDIO_PREFERENCE_FEATURES):
+                value = features.get(name)
+                # A zero tempo means it was never detected
+                if value is not None and (value or name != 'tempo'):
+                    track_rows[row, col] = value
+
+        self._audio_matrix = track_rows[inverse.reshape(-1)]
+        self._indexed_audio_features = audio_features
+
+        return self
+
     def build_profile(
         self,
         user_id: UUID,
@@ -16,27 +104,40 @@ class TasteProfiler:
         tracks: Dict[UUID, Dict],
         audio_features: Dict[UUID, Dict]
     ) -> Dict:
-        user_interactions = [i for i in interactions if i['user_id'] == user_id]
+        if interactions is not self._indexed_interactions or tracks is not self._indexed_tracks:
+            self.index_interactions(interactions, tracks)
+        if audio_features is not self._indexed_audio_features:
+            self.index_audio_features(audio_features)
 
-        if not user_interactions:
+        user_slice = self._by_user.get(user_id)
+        if user_slice is None:
             return self._empty_profile(user_id)
 
-        played_tracks = [i['track_id'] for i in user_interactions if i['interaction_type'] == 'play']
-        liked_tracks = [i['track_id'] for i in user_interactions if i['interaction_type'] == 'like']
-        skipped_tracks = [i['track_id'] for i in user_interactions if i['interaction_type'] == 'skip']
+        type_arr = self._interaction_types[user_slice]
+        tid_arr = self._track_ids[user_slice]
+        ts_arr = self._timestamps[user_slice]
+
+        play_mask = type_arr == 'play'
+        played_tracks = tid_arr[play_mask].tolist()
+        liked_tracks = tid_arr[type_arr == 'like'].tolist()
+        skipped_tracks = tid_arr[type_arr == 'skip'].tolist()
 
-        top_genres = self._analyze_genres(played_tracks, tracks)
+        played_codes = self._genre_codes[user_slice][play_mask]
+        genre_codes, genre_counts = self._count_genre_codes(played_codes)
+
+        top_genres = self._analyze_genres(genre_codes, genre_counts)
         top_artists = self._analyze_artists(played_tracks, tracks)
         top_decades = self._analyze_decades(played_tracks, tracks)
 
-        diversity_score = self._compute_diversity(played_tracks, tracks)
-        adventurousness = self._compute_adventurousness(user_interactions)
+        diversity_score = self._compute_diversity(genre_codes)
+        adventurousness = self._compute_adventurousness(ts_arr, tid_arr, datetime.utcnow())
 
-        audio_prefs = self._analyze_audio_preferences(played_tracks, audio_features)
+        audio_prefs = self._analyze_audio_preferences(self._audio_matrix[user_slice][play_mask])
 
-        listening_patterns = self._analyze_listening_patterns(user_interactions)
+        listening_patterns = self._analyze_listening_patterns(ts_arr)
 
-        predicted_likes = self._predict_likes(played_tracks, liked_tracks, tracks)
+        liked_codes = self._genre_codes[user_slice][type_arr == 'like']
+        predicted_likes = self._predict_likes(genre_codes, genre_counts, liked_codes)
 
         profile = {
             'user_id': user_id,
@@ -56,23 +157,65 @@ class TasteProfiler:
         self.user_profiles[user_id] = profile
         return profile
 
-    def _analyze_genres(self, track_ids: List[UUID], tracks: Dict) -> List[Dict]:
-        genre_counter = Counter()
+    @staticmethod
+    def _count_genre_codes(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return np.unique(codes[codes >= 0], return_counts=True)
 
-        for tid in track_ids:
-            track = tracks.get(tid)
-            if track and track.get('genre'):
-                genre_counter[track['genre']] += 1
+    def build_profiles_bulk(
+        self,
+        user_ids: List[UUID],
+        interactions: List[Dict],
+        tracks: Dict[UUID, Dict],
+        audio_features: Dict[UUID, Dict],
+        max_workers: Optional[int] = None
+    ) -> Dict[UUID, Dict]:
+        global _bulk_state
+
+        self.index_interactions(interactions, tracks)
+        self.index_audio_features(audio_features)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers <= 1 or len(user_ids) < 2 * max_workers or \
+                'fork' not in multiprocessing.get_all_start_methods():
+            return {
+                user_id: self.build_profile(user_id, interactions, tracks, audio_features)
+                for user_id in user_ids
+            }
+
+        # Forked workers inherit the columnar index and lookup dicts, so only
+        # user ids go out and finished profiles come back.
+        _bulk_state = (self, interactions, tracks, audio_features)
+        chunk_size = -(-len(user_ids) // (max_workers * 4))
+        chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+
+        results = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                for chunk, profiles in zip(chunks, executor.map(_build_profile_chunk, chunks)):
+                    results.update(zip(chunk, profiles))
+        finally:
+            _bulk_state = None
+
+        self.user_profiles.update(
+            (user_id, profile) for user_id, profile in results.items() if user_id in self._by_user
+        )
+        return results
+
+    def _analyze_genres(self, genre_codes: np.ndarray, genre_counts: np.ndarray) -> List[Dict]:
+        total = int(genre_counts.sum())
+        top_idx = np.argsort(-genre_counts, kind='stable')[:10]
 
-        total = sum(genre_counter.values())
         top_genres = [
             {
-                'genre': genre,
-                'play_count': count,
-                'percentage': round((count / total * 100), 2) if total > 0 else 0,
+                'genre': self._code_to_genre[genre_codes[i]],
+                'play_count': int(genre_counts[i]),
+                'percentage': round((int(genre_counts[i]) / total * 100), 2) if total > 0 else 0,
                 'trend': 'stable'
             }
-            for genre, count in genre_counter.most_common(10)
+            for i in top_idx
         ]
 
         return top_genres
@@ -113,68 +256,47 @@ class TasteProfiler:
 
         return top_decades
 
-    def _compute_diversity(self, track_ids: List[UUID], tracks: Dict) -> float:
-        genres = set()
-
-        for tid in track_ids:
-            track = tracks.get(tid)
-            if track and track.get('genre'):
-                genres.add(track['genre'])
-
+    def _compute_diversity(self, genre_codes: np.ndarray) -> float:
         max_expected_genres = 20
-        diversity = min(len(genres) / max_expected_genres, 1.0)
+        diversity = min(genre_codes.size / max_expected_genres, 1.0)
 
         return round(diversity, 2)
 
-    def _compute_adventurousness(self, interactions: List[Dict]) -> float:
-        if len(interactions) < 10:
+    def _compute_adventurousness(
+        self,
+        ts_arr: np.ndarray,
+        tid_arr: np.ndarray,
+        now: datetime
+    ) -> float:
+        if tid_arr.size < 10:
             return 0.5
 
-        recent_cutoff = datetime.utcnow() - timedelta(days=30)
-
-        recent_tracks = set()
-        for interaction in interactions:
-            if interaction.get('timestamp', datetime.utcnow()) >= recent_cutoff:
-                recent_tracks.add(interaction['track_id'])
+        recent_cutoff = np.datetime64(now, 's') - np.timedelta64(30, 'D')
+        recent_mask = ts_arr >= recent_cutoff
 
-        all_tracks = set(i['track_id'] for i in interactions)
+        n_recent = np.unique(tid_arr[recent_mask]).size
+        n_all = np.unique(tid_arr).size
 
-        if not all_tracks:
+        if not n_all:
             return 0.5
 
-        exploration_rate = len(recent_tracks) / len(all_tracks)
+        exploration_rate = n_recent / n_all
 
         return round(min(exploration_rate, 1.0), 2)
 
-    def _analyze_audio_preferences(
-        self,
-        track_ids: List[UUID],
-        audio_features: Dict[UUID, Dict]
-    ) -> Dict:
-        tempo_values = []
-        energy_values = []
-        valence_values = []
-        danceability_values = []
-        acousticness_values = []
-
-        for tid in track_ids:
-            features = audio_features.get(tid)
-            if not features:
-                continue
-
-            if features.get('tempo'):
-                tempo_values.append(features['tempo'])
-            if features.get('energy') is not None:
-                energy_values.append(features['energy'])
-            if features.get('valence') is not None:
-                valence_values.append(features['valence'])
-            if features.get('danceability') is not None:
-                danceability_values.append(features['danceability'])
-            if features.get('acousticness') is not None:
-                acousticness_values.append(features['acousticness'])
+    def _analyze_audio_preferences(self, feature_rows: np.ndarray) -> Dict:
+        columns = {
+            name: values[~np.isnan(values)]
+            for name, values in zip(AUDIO_PREFERENCE_FEATURES, feature_rows.T)
+        }
+        tempo_values = columns['tempo']
+        energy_values = columns['energy']
+        valence_values = columns['valence']
+        danceability_values = columns['danceability']
+        acousticness_values = columns['acousticness']
 
         def classify_value(values, thresholds):
-            if not values:
+            if not values.size:
                 return "unknown"
             avg = np.mean(values)
             for label, (low, high) in thresholds.items():
@@ -189,53 +311,36 @@ class TasteProfiler:
         })
 
         return {
-            'preferred_tempo_range': [int(np.percentile(tempo_values, 25)), int(np.percentile(tempo_values, 75))] if tempo_values else [100, 140],
+            'preferred_tempo_range': [int(np.percentile(tempo_values, 25)), int(np.percentile(tempo_values, 75))] if tempo_values.size else [100, 140],
             'preferred_energy_level': energy_label,
-            'avg_valence': round(np.mean(valence_values), 2) if valence_values else 0.5,
-            'avg_danceability': round(np.mean(danceability_values), 2) if danceability_values else 0.5,
-            'acoustic_preference': round(np.mean(acousticness_values), 2) if acousticness_values else 0.5,
+            'avg_valence': round(np.mean(valence_values), 2) if valence_values.size else 0.5,
+            'avg_danceability': round(np.mean(danceability_values), 2) if danceability_values.size else 0.5,
+            'acoustic_preference': round(np.mean(acousticness_values), 2) if acousticness_values.size else 0.5,
         }
 
-    def _analyze_listening_patterns(self, interactions: List[Dict]) -> Dict:
-        hour_counter = Counter()
+    def _analyze_listening_patterns(self, ts_arr: np.ndarray) -> Dict:
+        hours = (ts_arr.astype(np.int64) // 3600) % 24
+        counts = np.bincount(hours, minlength=24)
 
-        for interaction in interactions:
-            timestamp = interaction.get('timestamp', datetime.utcnow())
-            hour = timestamp.hour
-            hour_counter[hour] += 1
-
-        peak_hours = [hour for hour, _ in hour_counter.most_common(4)]
+        peak_hours = np.argpartition(-counts, 4)[:4]
+        peak_hours = peak_hours[counts[peak_hours] > 0]
 
         return {
-            'peak_hours': sorted(peak_hours),
-            'total_listening_sessions': len(interactions),
+            'peak_hours': sorted(peak_hours.tolist()),
+            'total_listening_sessions': int(ts_arr.size),
         }
 
     def _predict_likes(
         self,
-        played_tracks: List[UUID],
-        liked_tracks: List[UUID],
-        tracks: Dict
+        played_codes: np.ndarray,
+        played_counts: np.ndarray,
+        liked_codes: np.ndarray
     ) -> List[str]:
-        played_genres = Counter()
-        liked_genres = Counter()
-
-        for tid in played_tracks:
-            track = tracks.get(tid)
-            if track and track.get('genre'):
-                played_genres[track['genre']] += 1
-
-        for tid in liked_tracks:
-            track = tracks.get(tid)
-            if track and track.get('genre'):
-                liked_genres[track['genre']] += 1
-
-        predicted = []
-        for genre in played_genres.keys():
-            if genre not in liked_genres and played_genres[genre] >= 3:
-                predicted.append(genre)
+        candidates = played_codes[
+            (played_counts >= 3) & ~np.isin(played_codes, liked_codes[liked_codes >= 0])
+        ]
 
-        return predicted[:5]
+        return [self._code_to_genre[code] for code in candidates[:5]]
 
     def _empty_profile(self, user_id: UUID) -> Dict:
         return {
@@ -253,17 +358,123 @@ class TasteProfiler:
             'skip_rate': 0.0,
         }
 
+    @staticmethod
+    def _profile_schema():
+        import pyarrow as pa
+
+        return pa.schema([
+            ('user_id', pa.string()),
+            ('top_genres', pa.list_(pa.struct([
+                ('genre', pa.string()),
+                ('play_count', pa.int64()),
+                ('percentage', pa.float64()),
+                ('trend', pa.string()),
+            ]))),
+            ('top_artists', pa.list_(pa.struct([
+                ('artist', pa.string()),
+                ('play_count', pa.int64()),
+            ]))),
+            ('top_decades', pa.list_(pa.struct([
+                ('decade', pa.string()),
+                ('play_count', pa.int64()),
+                ('percentage', pa.float64()),
+            ]))),
+            ('diversity_score', pa.float64()),
+            ('adventurousness_score', pa.float64()),
+            ('preferred_tempo_range', pa.list_(pa.int64())),
+            ('preferred_energy_level', pa.string()),
+            ('avg_valence', pa.float64()),
+            ('avg_danceability', pa.float64()),
+            ('acoustic_preference', pa.float64()),
+            ('peak_hours', pa.list_(pa.int64())),
+            ('total_listening_sessions', pa.int64()),
+            ('predicted_likes', pa.list_(pa.string())),
+            ('total_plays', pa.int64()),
+            ('total_likes', pa.int64()),
+            ('skip_rate', pa.float64()),
+        ])
+
     def save(self, path: str):
-        import pickle
-        with open(path, 'wb') as f:
-            pickle.dump({'user_profiles': self.user_profiles}, f)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = []
+        for profile in self.user_profiles.values():
+            audio_prefs = profile['audio_preferences']
+            patterns = profile['listening_patterns']
+            rows.append({
+                'user_id': str(profile['user_id']),
+                'top_genres': profile['top_genres'],
+                'top_artists': profile['top_artists'],
+                'top_decades': profile['top_decades'],
+                'diversity_score': profile['diversity_score'],
+                'adventurousness_score': profile['adventurousness_score'],
+                'preferred_tempo_range': audio_prefs.get('preferred_tempo_range'),
+                'preferred_energy_level': audio_prefs.get('preferred_energy_level'),
+                'avg_valence': audio_prefs.get('avg_valence'),
+                'avg_danceability': audio_prefs.get('avg_danceability'),
+                'acoustic_preference': audio_prefs.get('acoustic_preference'),
+                'peak_hours': patterns.get('peak_hours'),
+                'total_listening_sessions': patterns.get('total_listening_sessions'),
+                'predicted_likes': profile['predicted_likes'],
+                'total_plays': profile['total_plays'],
+                'total_likes': profile['total_likes'],
+                'skip_rate': profile['skip_rate'],
+            })
+
+        table = pa.Table.from_pylist(rows, schema=self._profile_schema())
+        pq.write_table(table, path, compression='zstd')
 
     @classmethod
     def load(cls, path: str):
-        import pickle
-        with open(path, 'rb') as f:
-            data = pickle.load(f)
+        import pyarrow.parquet as pq
+        from utils.arrow_rows import ArrowRowMapping
+
+        table = pq.read_table(path, memory_map=True)
 
+        # Profiles stay in the mapped table and are decoded per user on first
+        # lookup; only the user_id column is read here.
         profiler = cls()
-        profiler.user_profiles = data['user_profiles']
-        return profiler
\ No newline at end of file
+        profiler.user_profiles = ArrowRowMapping(
+            table,
+            'user_id',
+            lambda rows: cls._profile_from_row(rows.to_pylist()[0]),
+            key_type=UUID,
+        )
+        return profiler
+
+    @staticmethod
+    def _profile_from_row(row: Dict) -> Dict:
+        user_id = UUID(row['user_id'])
+
+        audio_prefs = {}
+        if row['preferred_energy_level'] is not None:
+            audio_prefs = {
+                'preferred_tempo_range': row['preferred_tempo_range'],
+                'preferred_energy_level': row['preferred_energy_level'],
+                'avg_valence': row['avg_valence'],
+                'avg_danceability': row['avg_danceability'],
+                'acoustic_preference': row['acoustic_preference'],
+            }
+
+        patterns = {}
+        if row['total_listening_sessions'] is not None:
+            patterns = {
+                'peak_hours': row['peak_hours'],
+                'total_listening_sessions': row['total_listening_sessions'],
+            }
+
+        return {
+            'user_id': user_id,
+            'top_genres': row['top_genres'],
+            'top_artists': row['top_artists'],
+            'top_decades': row['top_decades'],
+            'diversity_score': row['diversity_score'],
+            'adventurousness_score': row['adventurousness_score'],
+            'audio_preferences': audio_prefs,
+            'listening_patterns': patterns,
+            'predicted_likes': row['predicted_likes'],
+            'total_plays': row['total_plays'],
+            'total_likes': row['total_likes'],
+            'skip_rate': row['skip_rate'],
+        }
@@ -1,34 +1,90 @@
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from uuid import UUID
+from collections import OrderedDict
+import time
 import faiss
 from sklearn.metrics.pairwise import cosine_similarity
-from collections import defaultdict
+
+
+_gpu_resources = None
+
+
+def _get_gpu_resources() -> "faiss.StandardGpuResources":
+    # Shared by every model in the process: each StandardGpuResources sets up
+    # its own CUDA streams and reserves a slice of device memory.
+    global _gpu_resources
+
+    if _gpu_resources is None:
+        _gpu_resources = faiss.StandardGpuResources()
+
+    return _gpu_resources
+
+
+def _index_to_gpu(index: faiss.Index) -> faiss.Index:
+    # float16 lookup tables keep IVF-PQ with a large pq_m (64 sub-quantizers
+    # for 512-d embeddings) within GPU shared memory
+    cloner_options = faiss.GpuClonerOptions()
+    cloner_options.useFloat16 = True
+    return faiss.index_cpu_to_gpu(_get_gpu_resources(), 0, index, cloner_options)
 
 
 class ContentBasedModel:
-    def __init__(self, embedding_dim: int = 512, use_gpu: bool = False):
+    NUMERIC_FEATURES = ('tempo', 'energy', 'valence', 'danceability', 'acousticness')
+
+    def __init__(
+        self,
+        embedding_dim: int = 512,
+        use_gpu: bool = False,
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        pq_m: int = 64,
+        ivf_threshold: int = 50_000,
+        similar_cache_size: int = 10_000,
+        similar_cache_ttl: float = 86400.0
+    ):
         self.embedding_dim = embedding_dim
         self.use_gpu = use_gpu
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        # Validated up front so a bad dimension fails here, not after a
+        # catalog grows past ivf_threshold
+        self._pq_subquantizers(embedding_dim, pq_m)
+        self.ivf_threshold = ivf_threshold
+        self.similar_cache_size = similar_cache_size
+        self.similar_cache_ttl = similar_cache_ttl
 
-        self.track_embeddings = {}
         self.track_features = {}
         self.faiss_index = None
         self.track_id_to_idx = {}
         self.idx_to_track_id = {}
+        self.genre_to_code = {}
+        self._idx_to_genre_code = np.empty(0, dtype=np.int32)
+        self._embedding_codes = np.empty((0, embedding_dim), dtype=np.uint8)
+        self._dequant_offset = np.zeros(embedding_dim, dtype=np.float32)
+        self._dequant_scale = np.ones(embedding_dim, dtype=np.float32)
+        self._numeric_feat_matrix = np.empty((0, len(self.NUMERIC_FEATURES)), dtype=np.float32)
+        self._similar_cache = OrderedDict()
 
     def fit(self, track_features: List[Dict]):
-        embeddings_list = []
-        track_ids = []
+        self._similar_cache.clear()
 
-        for idx, track in enumerate(track_features):
-            track_id = track['track_id']
-            embedding = track.get('embedding')
+        valid_tracks = [
+            track for track in track_features
+            if track.get('embedding') is not None
+            and len(track['embedding']) == self.embedding_dim
+        ]
 
-            if embedding is None or len(embedding) != self.embedding_dim:
-                continue
+        if not valid_tracks:
+            raise ValueError("No valid embeddings found in track_features")
+
+        embeddings_matrix = np.empty((len(valid_tracks), self.embedding_dim), dtype=np.float32)
 
-            self.track_embeddings[track_id] = np.array(embedding, dtype=np.float32)
+        for idx, track in enumerate(valid_tracks):
+            track_id = track['track_id']
+
+            embeddings_matrix[idx] = track['embedding']
             self.track_features[track_id] = {
                 'tempo': track.get('tempo'),
                 'energy': track.get('energy'),
@@ -38,28 +94,108 @@ class ContentBasedModel:
                 'genre': track.get('genre'),
             }
 
-            embeddings_list.append(embedding)
-            track_ids.append(track_id)
             self.track_id_to_idx[track_id] = idx
             self.idx_to_track_id[idx] = track_id
 
-        if not embeddings_list:
-            raise ValueError("No valid embeddings found in track_features")
-
-        embeddings_matrix = np.array(embeddings_list, dtype=np.float32)
+        self._quantize_embeddings(embeddings_matrix)
 
         faiss.normalize_L2(embeddings_matrix)
 
-        if self.use_gpu and faiss.get_num_gpus() > 0:
-            res = faiss.StandardGpuResources()
-            self.faiss_index = faiss.GpuIndexFlatIP(res, self.embedding_dim)
-        else:
-            self.faiss_index = faiss.IndexFlatIP(self.embedding_dim)
-
+        self.faiss_index = self._build_index(embeddings_matrix)
         self.faiss_index.add(embeddings_matrix)
 
+        self._build_track_arrays()
+
         return self
 
+    def _quantize_embeddings(self, embeddings_matrix: np.ndarray):
+        sq = faiss.ScalarQuantizer(self.embedding_dim, faiss.ScalarQuantizer.QT_8bit)
+        sq.train(embeddings_matrix)
+        self._embedding_codes = sq.compute_codes(embeddings_matrix)
+
+        # QT_8bit decodes each dimension affinely, so two reference rows give
+        # the offset and per-code step needed to dequantize sums of codes.
+        reference = sq.decode(np.array([
+            np.zeros(self.embedding_dim, dtype=np.uint8),
+            np.ones(self.embedding_dim, dtype=np.uint8),
+        ]))
+        self._dequant_offset = reference[0]
+        self._dequant_scale = reference[1] - reference[0]
+
+    def _dequantize(self, codes: np.ndarray) -> np.ndarray:
+        return self._dequant_offset + codes.astype(np.float32) * self._dequant_scale
+
+    def _build_track_arrays(self):
+        features = [
+            self.track_features[self.idx_to_track_id[idx]]
+            for idx in range(len(self.idx_to_track_id))
+        ]
+
+        genres = [f.get('genre') for f in features]
+        self.genre_to_code = {
+            genre: code for code, genre in enumerate(sorted({g for g in genres if g}))
+        }
+        self._idx_to_genre_code = np.array(
+            [self.genre_to_code.get(genre, -1) for genre in genres], dtype=np.int32
+        )
+
+        self._numeric_feat_matrix = np.array(
+            [
+                [np.nan if f.get(key) is None else f[key] for key in self.NUMERIC_FEATURES]
+                for f in features
+            ],
+            dtype=np.float32,
+        ).reshape(len(features), len(self.NUMERIC_FEATURES))
+
+    def _build_index(self, embeddings_matrix: np.ndarray) -> faiss.Index:
+        n_samples = embeddings_matrix.shape[0]
+        use_gpu = self.use_gpu and faiss.get_num_gpus() > 0
+
+        if n_samples <= self.ivf_threshold:
+            if use_gpu:
+                return faiss.GpuIndexFlatIP(_get_gpu_resources(), self.embedding_dim)
+
+            index = faiss.IndexScalarQuantizer(
+                self.embedding_dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings_matrix)
+            return index
+
+        nlist = self.nlist or int(4 * np.sqrt(n_samples))
+        pq_m = self._pq_subquantizers(self.embedding_dim, self.pq_m)
+
+        quantizer = faiss.IndexFlatIP(self.embedding_dim)
+        index = faiss.IndexIVFPQ(
+            quantizer, self.embedding_dim, nlist, pq_m, 8, faiss.METRIC_INNER_PRODUCT
+        )
+
+        # Move to GPU before training so the k-means and PQ training run there
+        if use_gpu:
+            index = _index_to_gpu(index)
+
+        index.train(embeddings_matrix)
+        index.nprobe = self.nprobe
+
+        return index
+
+    def _is_gpu_index(self) -> bool:
+        return self.faiss_index is not None and 'Gpu' in type(self.faiss_index).__name__
+
+    @staticmethod
+    def _pq_subquantizers(embedding_dim: int, pq_m: int) -> int:
+        # IVFPQ needs the dimension to split evenly; take the finest split
+        # that divides it. A single 8-bit sub-quantizer would encode the whole
+        # vector in 256 codes, so that is only accepted when asked for.
+        if pq_m < 1:
+            raise ValueError(f"pq_m must be at least 1, got {pq_m}")
+
+        m = max(m for m in range(1, min(pq_m, embedding_dim) + 1) if embedding_dim % m == 0)
+        if m == 1 and pq_m > 1:
+            raise ValueError(
+                f"embedding_dim {embedding_dim} has no divisor in 2..{pq_m} to use as pq_m"
+            )
+        return m
+
     def find_similar(
         self,
         track_id: UUID,
@@ -67,42 +203,82 @@ class ContentBasedModel:
         min_similarity: float = 0.7,
         genre_filter: Optional[str] = None
     ) -> List[Tuple[UUID, float]]:
-        if track_id not in self.track_embeddings:
-            return []
+        return self.find_similar_batch(
+            [track_id], k=k, min_similarity=min_similarity, genre_filter=genre_filter
+        )[track_id]
+
+    def find_similar_batch(
+        self,
+        track_ids: List[UUID],
+        k: int = 20,
+        min_similarity: float = 0.7,
+        genre_filter: Optional[str] = None
+    ) -> Dict[UUID, List[Tuple[UUID, float]]]:
+        results = {track_id: [] for track_id in track_ids}
+        now = time.monotonic()
+
+        known_ids = []
+        for track_id in results:
+            if track_id not in self.track_id_to_idx:
+                continue
+
+            cached = self._get_cached_similar((str(track_id), k, min_similarity, genre_filter), now)
+            if cached is not None:
+                results[track_id] = cached
+            else:
+                known_ids.append(track_id)
 
-        query_embedding = self.track_embeddings[track_id].reshape(1, -1).astype(np.float32)
-        faiss.normalize_L2(query_embedding)
+        if not known_ids:
+            return results
+
+        query_idx = np.array([self.track_id_to_idx[tid] for tid in known_ids])
+        queries = np.ascontiguousarray(self._dequantize(self._embedding_codes[query_idx]))
+        faiss.normalize_L2(queries)
 
         search_k = k * 5 if genre_filter else k + 1
 
-        distances, indices = self.faiss_index.search(query_embedding, search_k)
+        distances, indices = self.faiss_index.search(queries, search_k)
 
-        similar_tracks = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx == -1:
-                continue
+        mask = (indices != -1) & (indices != query_idx[:, None]) & (distances >= min_similarity)
 
-            similar_track_id = self.idx_to_track_id[idx]
+        if genre_filter:
+            genre_code = self.genre_to_code.get(genre_filter, -2)
+            mask &= self._idx_to_genre_code[indices] == genre_code
 
-            if similar_track_id == track_id:
-                continue
+        for row, track_id in enumerate(known_ids):
+            row_mask = mask[row]
+            results[track_id] = [
+                (self.idx_to_track_id[int(idx)], float(dist))
+                for idx, dist in zip(indices[row][row_mask][:k], distances[row][row_mask][:k])
+            ]
+            self._cache_similar(
+                (str(track_id), k, min_similarity, genre_filter), results[track_id], now
+            )
 
-            similarity = float(dist)
+        return results
 
-            if similarity < min_similarity:
-                continue
+    def _get_cached_similar(self, key: Tuple, now: float) -> Optional[List[Tuple[UUID, float]]]:
+        entry = self._similar_cache.get(key)
+        if entry is None:
+            return None
+
+        cached_at, similar = entry
+        if now - cached_at > self.similar_cache_ttl:
+            del self._similar_cache[key]
+            return None
 
-            if genre_filter:
-                track_genre = self.track_features.get(similar_track_id, {}).get('genre')
-                if track_genre != genre_filter:
-                    continue
+        self._similar_cache.move_to_end(key)
+        return list(similar)
 
-            similar_tracks.append((similar_track_id, similarity))
+    def _cache_similar(self, key: Tuple, similar: List[Tuple[UUID, float]], now: float):
+        if self.similar_cache_size <= 0:
+            return
 
-            if len(similar_tracks) >= k:
-                break
+        self._similar_cache[key] = (now, list(similar))
+        self._similar_cache.move_to_end(key)
 
-        return similar_tracks
+        while len(self._similar_cache) > self.similar_cache_size:
+            self._similar_cache.popitem(last=False)
 
     def recommend_by_features(
         self,
@@ -110,61 +286,70 @@ class ContentBasedModel:
         k: int = 20,
         exclude_tracks: Optional[List[UUID]] = None
     ) -> List[Tuple[UUID, float]]:
-        exclude_set = set(exclude_tracks) if exclude_tracks else set()
+        target = np.array([
+            target_features.get('tempo', 120),
+            target_features.get('energy', 0.5),
+            target_features.get('valence', 0.5),
+            target_features.get('danceability', 0.5),
+        ], dtype=np.float32)
 
-        target_tempo = target_features.get('tempo', 120)
-        target_energy = target_features.get('energy', 0.5)
-        target_valence = target_features.get('valence', 0.5)
-        target_danceability = target_features.get('danceability', 0.5)
+        features = self._numeric_feat_matrix[:, :4]
+        valid = ~np.isnan(features).any(axis=1)
 
-        track_scores = []
-        for track_id, features in self.track_features.items():
-            if track_id in exclude_set:
-                continue
+        if exclude_tracks:
+            exclude_idx = [
+                self.track_id_to_idx[tid] for tid in exclude_tracks if tid in self.track_id_to_idx
+            ]
+            valid[exclude_idx] = False
 
-            if any(features[k] is None for k in ['tempo', 'energy', 'valence', 'danceability']):
-                continue
+        diffs = np.abs(features - target)
+        diffs[:, 0] /= 200.0
+
+        scores = 1.0 - diffs @ np.array([0.2, 0.3, 0.3, 0.2], dtype=np.float32)
+        scores = np.maximum(scores, 0.0)
 
-            tempo_diff = abs(features['tempo'] - target_tempo) / 200.0
-            energy_diff = abs(features['energy'] - target_energy)
-            valence_diff = abs(features['valence'] - target_valence)
-            dance_diff = abs(features['danceability'] - target_danceability)
+        candidates = np.flatnonzero(valid)
+        top_idx = candidates[self._top_k_indices(scores[candidates], k)]
 
-            score = 1.0 - (0.2 * tempo_diff + 0.3 * energy_diff + 0.3 * valence_diff + 0.2 * dance_diff)
+        return [(self.idx_to_track_id[int(idx)], float(scores[idx])) for idx in top_idx]
 
-            track_scores.append((track_id, max(0.0, score)))
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        if k <= 0 or not scores.size:
+            return np.empty(0, dtype=np.int64)
 
-        track_scores.sort(key=lambda x: x[1], reverse=True)
+        if k < scores.size:
+            top_idx = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top_idx = np.arange(scores.size)
 
-        return track_scores[:k]
+        return top_idx[np.argsort(-scores[top_idx], kind='stable')]
 
     def build_user_taste_profile(self, user_track_history: List[UUID]) -> Dict:
         if not user_track_history:
             return {}
 
-        valid_embeddings = [
-            self.track_embeddings[tid]
-            for tid in user_track_history
-            if tid in self.track_embeddings
-        ]
+        idx = np.fromiter(
+            (
+                self.track_id_to_idx[tid]
+                for tid in user_track_history
+                if tid in self.track_id_to_idx
+            ),
+            dtype=np.int64,
+        )
 
-        if not valid_embeddings:
+        if not idx.size:
             return {}
 
-        avg_embedding = np.mean(valid_embeddings, axis=0)
+        code_sums = self._embedding_codes[idx].sum(axis=0, dtype=np.int32)
+        avg_embedding = self._dequantize((code_sums / idx.size).astype(np.float32))
 
-        feature_arrays = defaultdict(list)
-        for track_id in user_track_history:
-            if track_id in self.track_features:
-                features = self.track_features[track_id]
-                for key, value in features.items():
-                    if value is not None and key != 'genre':
-                        feature_arrays[key].append(value)
+        rows = self._numeric_feat_matrix[idx]
+        has_values = ~np.isnan(rows).all(axis=0)
+        averages = np.nanmean(rows[:, has_values], axis=0)
 
-        avg_features = {
-            key: np.mean(values) if values else None
-            for key, values in feature_arrays.items()
-        }
+        feature_keys = [key for key, present in zip(self.NUMERIC_FEATURES, has_values) if present]
+        avg_features = {key: float(value) for key, value in zip(feature_keys, averages)}
 
         return {
             'embedding': avg_embedding,
@@ -174,15 +359,20 @@ class ContentBasedModel:
     def save(self, path: str):
         import pickle
 
-        faiss.write_index(self.faiss_index, f"{path}.faiss")
+        # GPU indexes can't be serialized directly
+        index = faiss.index_gpu_to_cpu(self.faiss_index) if self._is_gpu_index() else self.faiss_index
+        faiss.write_index(index, f"{path}.faiss")
 
         with open(f"{path}.pkl", 'wb') as f:
             pickle.dump({
-                'track_embeddings': self.track_embeddings,
+                'embedding_codes': self._embedding_codes,
+                'dequant_offset': self._dequant_offset,
+                'dequant_scale': self._dequant_scale,
                 'track_features': self.track_features,
                 'track_id_to_idx': self.track_id_to_idx,
                 'idx_to_track_id': self.idx_to_track_id,
                 'embedding_dim': self.embedding_dim,
+                'nprobe': self.nprobe,
             }, f)
 
     @classmethod
@@ -192,16 +382,24 @@ class ContentBasedModel:
         with open(f"{path}.pkl", 'rb') as f:
             data = pickle.load(f)
 
-        model = cls(embedding_dim=data['embedding_dim'], use_gpu=use_gpu)
-        model.track_embeddings = data['track_embeddings']
+        model = cls(
+            embedding_dim=data['embedding_dim'],
+            use_gpu=use_gpu,
+            nprobe=data.get('nprobe', 16)
+        )
         model.track_features = data['track_features']
         model.track_id_to_idx = data['track_id_to_idx']
         model.idx_to_track_id = data['idx_to_track_id']
+        model._embedding_codes = data['embedding_codes']
+        model._dequant_offset = data['dequant_offset']
+        model._dequant_scale = data['dequant_scale']
+        model._build_track_arrays()
 
         model.faiss_index = faiss.read_index(f"{path}.faiss")
+        if hasattr(model.faiss_index, 'nprobe'):
+            model.faiss_index.nprobe = model.nprobe
 
         if use_gpu and faiss.get_num_gpus() > 0:
-            res = faiss.StandardGpuResources()
-            model.faiss_index = faiss.index_cpu_to_gpu(res, 0, model.faiss_index)
+            model.faiss_index = _index_to_gpu(model.faiss_index)
 
         return model
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import List, Dict
 from uuid import UUID
-from collections import Counter
-import random
+import numpy as np
+import pandas as pd
 
 
 class DailyMixGenerator:
@@ -9,42 +9,60 @@ class DailyMixGenerator:
         self.familiarity_ratio = familiarity_ratio
         self.discovery_ratio = 1.0 - familiarity_ratio
 
-        self.user_genre_history = {}
+        self.user_top_genres = {}
         self.genre_tracks = {}
+        self.track_ids = []
+        self.track_id_to_idx = {}
 
     def fit(self, interactions: List[Dict], tracks: Dict[UUID, Dict]):
-        user_plays = {}
-        for interaction in interactions:
-            if interaction['interaction_type'] != 'play':
-                continue
-
-            user_id = interaction['user_id']
-            track_id = interaction['track_id']
-
-            if user_id not in user_plays:
-                user_plays[user_id] = []
-
-            user_plays[user_id].append(track_id)
-
-        for user_id, played_tracks in user_plays.items():
-            genre_counter = Counter()
-
-            for track_id in played_tracks:
-                track = tracks.get(track_id)
-                if track and track.get('genre'):
-                    genre_counter[track['genre']] += 1
-
-            self.user_genre_history[user_id] = genre_counter
-
-        for track_id, track_data in tracks.items():
-            genre = track_data.get('genre')
-            if genre:
-                if genre not in self.genre_tracks:
-                    self.genre_tracks[genre] = []
-                self.genre_tracks[genre].append(track_id)
+        df = pd.DataFrame(interactions, columns=['user_id', 'track_id', 'interaction_type'])
+        plays = df[df['interaction_type'] == 'play']
+
+        track_genres = {tid: t['genre'] for tid, t in tracks.items() if t.get('genre')}
+        genre_counts = (
+            plays.assign(genre=plays['track_id'].map(track_genres))
+            .dropna(subset=['genre'])
+            .groupby(['user_id', 'genre'])
+            .size()
+            .reset_index(name='play_count')
+            .sort_values('play_count', ascending=False, kind='stable')
+        )
+
+        self.user_top_genres = {user_id: [] for user_id in plays['user_id'].unique()}
+        self.user_top_genres.update(
+            genre_counts.groupby('user_id', sort=False)['genre'].agg(list).to_dict()
+        )
+
+        self.track_ids = [tid for tid, track_data in tracks.items() if track_data.get('genre')]
+        self.track_id_to_idx = {tid: idx for idx, tid in enumerate(self.track_ids)}
+
+        genres = np.asarray([tracks[tid]['genre'] for tid in self.track_ids], dtype=object)
+        self.genre_tracks = self._group_by_genre(genres)
 
         return self
 
+    @staticmethod
+    def _group_by_genre(genres: np.ndarray) -> Dict[str, np.ndarray]:
+        genre_names, genre_codes = np.unique(genres, return_inverse=True)
+        order = np.argsort(genre_codes, kind='stable').astype(np.int32)
+        splits = np.cumsum(np.bincount(genre_codes, minlength=genre_names.size))[:-1]
+
+        return {
+            str(genre): indices
+            for genre, indices in zip(genre_names, np.split(order, splits))
+        }
+
+    def _played_indices(self, user_played_tracks: List[UUID]) -> np.ndarray:
+        indices = np.fromiter(
+            (
+                self.track_id_to_idx[tid]
+                for tid in user_played_tracks
+                if tid in self.track_id_to_idx
+            ),
+            dtype=np.int32,
+        )
+        return np.unique(indices)
+
     def generate_mixes(
         self,
         user_id: UUID,
@@ -52,36 +70,41 @@ class DailyMixGenerator:
         mix_count: int = 6,
         tracks_per_mix: int = 50
     ) -> List[Dict]:
-        if user_id not in self.user_genre_history:
+        if user_id not in self.user_top_genres:
             return self._generate_cold_start_mixes(mix_count, tracks_per_mix)
 
-        genre_counts = self.user_genre_history[user_id]
-        top_genres = [genre for genre, _ in genre_counts.most_common(mix_count)]
+        top_genres = self.user_top_genres[user_id][:mix_count]
+
+        rng = np.random.default_rng()
+        played_arr = self._played_indices(user_played_tracks)
 
         mixes = []
         for idx, genre in enumerate(top_genres):
             if genre not in self.genre_tracks:
                 continue
 
-            all_genre_tracks = self.genre_tracks[genre]
-            played_in_genre = [tid for tid in user_played_tracks if tid in all_genre_tracks]
-            unplayed_in_genre = [tid for tid in all_genre_tracks if tid not in user_played_tracks]
+            genre_arr = self.genre_tracks[genre]
+            played_mask = np.isin(genre_arr, played_arr, assume_unique=True)
+            played_in_genre = genre_arr[played_mask]
+            unplayed_in_genre = genre_arr[~played_mask]
 
             familiar_count = int(tracks_per_mix * self.familiarity_ratio)
             discovery_count = tracks_per_mix - familiar_count
 
-            familiar_tracks = random.sample(
+            familiar_idx = rng.choice(
                 played_in_genre,
-                min(familiar_count, len(played_in_genre))
+                size=min(familiar_count, played_in_genre.size),
+                replace=False
             )
 
-            discovery_tracks = random.sample(
+            discovery_idx = rng.choice(
                 unplayed_in_genre,
-                min(discovery_count, len(unplayed_in_genre))
+                size=min(discovery_count, unplayed_in_genre.size),
+                replace=False
             )
 
-            mix_tracks = familiar_tracks + discovery_tracks
-            random.shuffle(mix_tracks)
+            mix_idx = rng.permutation(np.concatenate([familiar_idx, discovery_idx]))
+            mix_tracks = [self.track_ids[i] for i in mix_idx]
 
             mixes.append({
                 'mix_id': f'daily-mix-{idx+1}',
@@ -90,7 +113,7 @@ class DailyMixGenerator:
                 'genre': genre,
                 'tracks': mix_tracks,
                 'total_tracks': len(mix_tracks),
-                'familiar_ratio': len(familiar_tracks) / len(mix_tracks) if mix_tracks else 0,
+                'familiar_ratio': familiar_idx.size / len(mix_tracks) if mix_tracks else 0,
             })
 
         return mixes
@@ -98,13 +121,17 @@ class DailyMixGenerator:
     def _generate_cold_start_mixes(self, mix_count: int, tracks_per_mix: int) -> List[Dict]:
         available_genres = list(self.genre_tracks.keys())[:mix_count]
 
+        rng = np.random.default_rng()
+
         mixes = []
         for idx, genre in enumerate(available_genres):
-            genre_track_list = self.genre_tracks[genre]
-            sampled_tracks = random.sample(
-                genre_track_list,
-                min(tracks_per_mix, len(genre_track_list))
+            genre_arr = self.genre_tracks[genre]
+            sampled_idx = rng.choice(
+                genre_arr,
+                size=min(tracks_per_mix, genre_arr.size),
+                replace=False
             )
+            sampled_tracks = [self.track_ids[i] for i in sampled_idx]
 
             mixes.append({
                 'mix_id': f'daily-mix-{idx+1}',
@@ -119,22 +146,68 @@ class DailyMixGenerator:
         return mixes
 
     def save(self, path: str):
-        import pickle
-        with open(path, 'wb') as f:
-            pickle.dump({
-                'user_genre_history': self.user_genre_history,
-                'genre_tracks': self.genre_tracks,
-                'familiarity_ratio': self.familiarity_ratio,
-            }, f)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from utils.arrow_rows import ArrowRowMapping
+
+        tracks_table = pa.table(
+            {
+                'track_id': [str(tid) for tid in self.track_ids],
+                'genre': self._track_genres(),
+            },
+            metadata={'familiarity_ratio': str(self.familiarity_ratio)},
+        )
+        pq.write_table(tracks_table, f"{path}.tracks.parquet", compression='zstd')
+
+        # Users without top genres are still known to the model, so they get
+        # a placeholder row (null genre, rank -1) instead of being dropped
+        user_rows = [
+            (str(user_id), genre, rank)
+            for user_id, top_genres in self.user_top_genres.items()
+            for rank, genre in (enumerate(top_genres) if top_genres else [(-1, None)])
+        ]
+        users_table = pa.table({
+            'user_id': pa.array([row[0] for row in user_rows], type=pa.string()),
+            'genre': pa.array([row[1] for row in user_rows], type=pa.string()),
+            'rank': pa.array([row[2] for row in user_rows], type=pa.int32()),
+        })
+        pq.write_table(users_table, f"{path}.users.parquet", compression='zstd')
+
+    def _track_genres(self) -> List[str]:
+        genres = [None] * len(self.track_ids)
+        for genre, indices in self.genre_tracks.items():
+            for idx in indices:
+                genres[idx] = genre
+        return genres
 
     @classmethod
     def load(cls, path: str):
-        import pickle
-        with open(path, 'rb') as f:
-            data = pickle.load(f)
-
-        model = cls(familiarity_ratio=data['familiarity_ratio'])
-        model.user_genre_history = data['user_genre_history']
-        model.genre_tracks = data['genre_tracks']
-
-        return model
\ No newline at end of file
+        import pyarrow.parquet as pq
+        from utils.arrow_rows import ArrowRowMapping
+
+        tracks_table = pq.read_table(f"{path}.tracks.parquet", memory_map=True)
+        metadata = tracks_table.schema.metadata or {}
+
+        model = cls(familiarity_ratio=float(metadata.get(b'familiarity_ratio', 0.8)))
+        model.track_ids = [UUID(tid) for tid in tracks_table.column('track_id').to_pylist()]
+        model.track_id_to_idx = {tid: idx for idx, tid in enumerate(model.track_ids)}
+
+        genres = tracks_table.column('genre').to_numpy(zero_copy_only=False)
+        model.genre_tracks = cls._group_by_genre(genres)
+
+        # Rows are grouped by user and ordered by rank on save, so each user's
+        # genres are one slice of the mapped table, decoded on first lookup
+        users_table = pq.read_table(f"{path}.users.parquet", memory_map=True)
+        model.user_top_genres = ArrowRowMapping(
+            users_table, 'user_id', cls._top_genres_from_rows, key_type=UUID
+        )
+
+        return model
+
+    @staticmethod
+    def _top_genres_from_rows(rows) -> List[str]:
+        return [
+            genre
+            for genre, rank in zip(rows.column('genre').to_pylist(), rows.column('rank').to_pylist())
+            if rank >= 0
+        ]
@@ -1,5 +1,6 @@
 from typing import List, Dict, Tuple
 from uuid import UUID
+import heapq
 import numpy as np
 
 
@@ -52,9 +53,7 @@ class SimpleHybridModel:
 
             hybrid_scores.append((track_id, hybrid_score))
 
-        hybrid_scores.sort(key=lambda x: x[1], reverse=True)
-
-        return hybrid_scores[:k]
+        return heapq.nlargest(k, hybrid_scores, key=lambda x: x[1])
 
     def save(self, path: str):
         import pickle
@@ -5,7 +5,7 @@ TuneTrail ML Engine - FAISS Index Builder
 Build and optimize FAISS indexes for fast similarity search on audio embeddings.
 
 Usage:
-    python scripts/build_faiss_index.py [--force] [--gpu] [--index-type flat|ivf]
+    python scripts/build_faiss_index.py [--force] [--gpu] [--index-type flat|ivf|pq]
 
 Examples:
     python scripts/build_faiss_index.py --gpu --index-type ivf
@@ -14,12 +14,15 @@ Examples:
 
 import asyncio
 import argparse
+import hashlib
 import sys
 import os
 import logging
+import time
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -38,6 +41,53 @@ logging.basicConfig(
 
 logger = logging.getLogger("build_faiss_index")
 
+_gpu_resources = None
+
+
+def get_gpu_resources() -> "faiss.StandardGpuResources":
+    """
+    Return the process-wide GPU resources object, creating it on first use.
+
+    Every builder in this process shares it, so the CUDA context and the
+    reserved temp/pinned memory are set up once rather than per index.
+    """
+    global _gpu_resources
+
+    if _gpu_resources is None:
+        res = faiss.StandardGpuResources()
+        res.setTempMemory(Config.FAISS_GPU_TEMP_MEMORY_MB * 1024 * 1024)
+        res.setPinnedMemory(Config.FAISS_GPU_PINNED_MEMORY_MB * 1024 * 1024)
+        _gpu_resources = res
+
+    return _gpu_resources
+
+
+def _commit_file(tmp_path: str, path: str):
+    """
+    Durably move a fully written temp file into place.
+
+    The data is fsynced before os.replace and the parent directory after it,
+    so readers (and a crash) only ever see the old file or the complete new
+    one, and the rename itself survives a crash. The written pages are
+    dropped from the page cache afterwards since this process doesn't read
+    them back.
+    """
+    fd = os.open(tmp_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+    os.replace(tmp_path, path)
+
+    dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
 
 class FAISSIndexBuilder:
     """FAISS index builder for audio embeddings."""
@@ -46,13 +96,25 @@ class FAISSIndexBuilder:
         self.force_rebuild = force_rebuild
         self.use_gpu = use_gpu and Config.ENABLE_GPU
         self.start_time = datetime.now()
+        self._rng = np.random.default_rng()
+
+        self._gpu_res = None
+        if self.use_gpu and faiss.get_num_gpus() > 0:
+            self._gpu_res = get_gpu_resources()
+
+        # Use every CPU this process may run on; FAISS search parallelizes
+        # over the query batch with OpenMP
+        self.num_threads = (
+            len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+        ) or 1
+        faiss.omp_set_num_threads(self.num_threads)
 
     async def build_all_indexes(self, index_type: str = "auto") -> Dict:
         """
         Build all FAISS indexes for similarity search.
 
         Args:
-            index_type: Type of index to build ("flat", "ivf", or "auto")
+            index_type: Type of index to build ("flat", "ivf", "pq", or "auto")
 
         Returns:
             Dictionary with build results and metrics
@@ -62,16 +124,18 @@ class FAISSIndexBuilder:
         logger.info(f"Index type: {index_type}")
         logger.info(f"GPU enabled: {self.use_gpu}")
         logger.info(f"Force rebuild: {self.force_rebuild}")
+        logger.info(f"FAISS OpenMP threads: {self.num_threads}")
+        logger.info(f"FAISS compile options: {faiss.get_compile_options()}")
 
         try:
             # Load audio features
-            audio_features = await self._load_and_validate_features()
+            embeddings, track_ids = await self._load_and_validate_features()
 
-            if not audio_features:
+            if not track_ids:
                 raise ValueError("No audio features available for index building")
 
             # Build main embedding index
-            main_index_result = await self._build_embedding_index(audio_features, index_type)
+            main_index_result = self._build_embedding_index(embeddings, track_ids, index_type)
 
             # Build additional specialized indexes
             results = {
@@ -86,36 +150,57 @@ class FAISSIndexBuilder:
             logger.error(f"FAISS index building failed: {e}")
             raise
 
-    async def _load_and_validate_features(self) -> List[Dict]:
-        """Load and validate audio features."""
+    async def _load_and_validate_features(self) -> Tuple[np.ndarray, List[str]]:
+        """
+        Load and validate audio features.
+
+        Returns:
+            Tuple of a contiguous (N, 512) float32 embedding matrix and the
+            track IDs of its rows
+        """
         logger.info("📊 Loading audio features...")
 
         audio_features = await load_audio_features()
         logger.info(f"Loaded {len(audio_features)} audio feature records")
 
-        if not audio_features:
-            return []
-
         # Validate embeddings
-        valid_features = []
-        for feature in audio_features:
-            if feature.get('embedding') and len(feature['embedding']) == 512:
-                valid_features.append(feature)
+        valid_features = [
+            feature for feature in audio_features
+            if feature.get('embedding') and len(feature['embedding']) == 512
+        ]
 
         logger.info(f"Found {len(valid_features)} valid 512-dimensional embeddings")
 
         if len(valid_features) < 10:
             logger.warning("Very few valid embeddings found. Index quality may be poor.")
 
-        return valid_features
+        # Copy straight into one preallocated float32 matrix
+        embeddings = np.empty((len(valid_features), 512), dtype=np.float32)
+        for i, feature in enumerate(valid_features):
+            embeddings[i] = feature['embedding']
+
+        track_ids = [feature['track_id'] for feature in valid_features]
 
-    async def _build_embedding_index(self, audio_features: List[Dict], index_type: str) -> Dict:
+        return embeddings, track_ids
+
+    def _build_embedding_index(
+        self,
+        embeddings: np.ndarray,
+        track_ids: List[str],
+        index_type: str
+    ) -> Dict:
         """Build the main embedding similarity index."""
         logger.info("🏗️ Building main embedding similarity index...")
 
-        # Extract embeddings
-        embeddings = np.array([f['embedding'] for f in audio_features], dtype=np.float32)
-        track_ids = [f['track_id'] for f in audio_features]
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        # Normalize once for cosine similarity; every index builder below
+        # expects unit-norm input
+        faiss.normalize_L2(embeddings)
+
+        sample_norms = np.linalg.norm(embeddings[:64], axis=1)
+        if np.abs(sample_norms - 1).max(initial=0) > 1e-4:
+            logger.warning("Some embeddings are not unit-norm after normalization (zero vectors?)")
 
         logger.info(f"Building index with {len(embeddings)} vectors of dimension {embeddings.shape[1]}")
 
@@ -124,9 +209,23 @@ class FAISSIndexBuilder:
             if len(embeddings) < 1000:
                 index_type = "flat"
                 logger.info("Auto-selected IndexFlatIP (< 1000 vectors)")
-            else:
+            elif len(embeddings) < Config.FAISS_PQ_THRESHOLD:
                 index_type = "ivf"
-                logger.info("Auto-selected IndexIVFFlat (>= 1000 vectors)")
+                logger.info(
+                    f"Auto-selected IndexIVFScalarQuantizer (< {Config.FAISS_PQ_THRESHOLD} vectors)"
+                )
+            else:
+                index_type = "pq"
+                logger.info(f"Auto-selected OPQ+IVF+PQ (>= {Config.FAISS_PQ_THRESHOLD} vectors)")
+
+            if index_type != "pq":
+                projected_mb = self._projected_index_size_mb(index_type, embeddings.shape)
+                if projected_mb > Config.FAISS_INDEX_MEMORY_BUDGET_MB:
+                    logger.info(
+                        f"Projected {index_type} index size {projected_mb:.0f}MB exceeds budget "
+                        f"{Config.FAISS_INDEX_MEMORY_BUDGET_MB}MB; escalating to OPQ+IVF+PQ"
+                    )
+                    index_type = "pq"
 
         # Build index
         start_time = datetime.now()
@@ -136,6 +235,8 @@ class FAISSIndexBuilder:
                 index = self._build_flat_index(embeddings)
             elif index_type == "ivf":
                 index = self._build_ivf_index(embeddings)
+            elif index_type == "pq":
+                index = self._build_pq_index(embeddings)
             else:
                 raise ValueError(f"Unknown index type: {index_type}")
 
@@ -145,7 +246,7 @@ class FAISSIndexBuilder:
             test_results = self._test_index_performance(index, embeddings)
 
             # Save index and metadata
-            self._save_index_and_metadata(index, track_ids, index_type, test_results)
+            index_path = self._save_index_and_metadata(index, track_ids, index_type, test_results)
 
             result = {
                 'index_type': index_type,
@@ -154,7 +255,7 @@ class FAISSIndexBuilder:
                 'build_time_seconds': build_duration,
                 'use_gpu': self.use_gpu,
                 'performance_metrics': test_results,
-                'index_size_mb': self._estimate_index_size(index),
+                'index_size_mb': self._index_file_size_mb(index_path),
                 'status': 'success'
             }
 
@@ -170,52 +271,65 @@ class FAISSIndexBuilder:
             }
 
     def _build_flat_index(self, embeddings: np.ndarray) -> faiss.Index:
-        """Build IndexFlatIP for exact similarity search."""
+        """Build IndexFlatIP for exact similarity search over unit-norm embeddings."""
         logger.info("Building IndexFlatIP (exact search)...")
 
         dimension = embeddings.shape[1]
 
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
-
-        if self.use_gpu and faiss.get_num_gpus() > 0:
+        if self._gpu_res is not None:
             logger.info("Using GPU acceleration")
-            res = faiss.StandardGpuResources()
-            index = faiss.GpuIndexFlatIP(res, dimension)
+            index = faiss.GpuIndexFlatIP(self._gpu_res, dimension)
         else:
             index = faiss.IndexFlatIP(dimension)
 
-        index.add(embeddings)
+        self._add_vectors(index, embeddings)
         return index
 
+    def _add_vectors(self, index: faiss.Index, embeddings: np.ndarray):
+        """
+        Add vectors to an index.
+
+        GPU indexes get the vectors in FAISS_GPU_ADD_BATCH_SIZE batches, so
+        each synchronous add copies and assigns a bounded slice and the
+        device-side staging memory stays small however large the catalog is.
+        """
+        if self._gpu_res is None:
+            index.add(embeddings)
+            return
+
+        batch_size = Config.FAISS_GPU_ADD_BATCH_SIZE
+        for start in range(0, len(embeddings), batch_size):
+            index.add(embeddings[start:start + batch_size])
+
     def _build_ivf_index(self, embeddings: np.ndarray) -> faiss.Index:
-        """Build IndexIVFFlat for approximate similarity search."""
-        logger.info("Building IndexIVFFlat (approximate search)...")
+        """Build IndexIVFScalarQuantizer for approximate search over unit-norm embeddings."""
+        logger.info(f"Building IndexIVFScalarQuantizer ({Config.FAISS_SQ_TYPE})...")
 
         dimension = embeddings.shape[1]
         nlist = min(Config.FAISS_NLIST, len(embeddings) // 10)  # Reasonable nlist
 
         logger.info(f"Using nlist={nlist} for {len(embeddings)} vectors")
 
-        # Normalize embeddings
-        faiss.normalize_L2(embeddings)
-
         # Create quantizer and index
         quantizer = faiss.IndexFlatIP(dimension)
-        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        sq_type = getattr(faiss.ScalarQuantizer, Config.FAISS_SQ_TYPE)
+        index = faiss.IndexIVFScalarQuantizer(
+            quantizer, dimension, nlist, sq_type, faiss.METRIC_INNER_PRODUCT
+        )
+
+        # Move to GPU before training so the k-means runs there
+        if self._gpu_res is not None:
+            logger.info("Moving index to GPU")
+            cloner_options = faiss.GpuClonerOptions()
+            cloner_options.useFloat16 = True
+            index = faiss.index_cpu_to_gpu(self._gpu_res, 0, index, cloner_options)
 
         # Train index
         logger.info("Training IVF index...")
         index.train(embeddings)
 
-        # Move to GPU if available
-        if self.use_gpu and faiss.get_num_gpus() > 0:
-            logger.info("Moving index to GPU")
-            res = faiss.StandardGpuResources()
-            index = faiss.index_cpu_to_gpu(res, 0, index)
-
         # Add vectors
-        index.add(embeddings)
+        self._add_vectors(index, embeddings)
 
         # Set search parameters
         if hasattr(index, 'nprobe'):
@@ -223,86 +337,201 @@ class FAISSIndexBuilder:
 
         return index
 
+    def _build_pq_index(self, embeddings: np.ndarray) -> faiss.Index:
+        """Build an OPQ + IVF (HNSW coarse quantizer) + PQ index for large corpora."""
+        dimension = embeddings.shape[1]
+        nlist = int(4 * np.sqrt(len(embeddings)))
+        factory_string = f"OPQ64_128,IVF{nlist}_HNSW32,PQ64"
+
+        logger.info(f"Building {factory_string} (compressed approximate search)...")
+
+        index = faiss.index_factory(dimension, factory_string, faiss.METRIC_INNER_PRODUCT)
+
+        # Train on a subsample; k-means and PQ codebooks converge well before N
+        num_train = min(len(embeddings), 256 * nlist)
+        train_indices = self._rng.choice(len(embeddings), num_train, replace=False, shuffle=False)
+        logger.info(f"Training OPQ/IVF/PQ on {num_train} vectors...")
+        index.train(embeddings[train_indices])
+
+        index.add(embeddings)
+
+        # Set search parameters
+        params = faiss.ParameterSpace()
+        params.set_index_parameter(index, 'nprobe', Config.FAISS_NPROBE)
+        params.set_index_parameter(index, 'quantizer_efSearch', Config.FAISS_HNSW_EF_SEARCH)
+
+        return index
+
     def _test_index_performance(self, index: faiss.Index, embeddings: np.ndarray) -> Dict:
         """Test index search performance."""
         logger.info("🧪 Testing index performance...")
 
-        # Select random test queries
-        num_queries = min(100, len(embeddings))
-        query_indices = np.random.choice(len(embeddings), num_queries, replace=False)
+        # Reuse the query set of a cached ground truth for these embeddings,
+        # otherwise select random test queries
+        cache_path = self._exact_topk_cache_path(embeddings)
+        query_indices, exact_indices = self._load_exact_topk(cache_path, len(embeddings))
+
+        if query_indices is None:
+            num_queries = min(4096, len(embeddings))
+            query_indices = self._rng.choice(len(embeddings), num_queries, replace=False, shuffle=False)
+
+        num_queries = len(query_indices)
         test_queries = embeddings[query_indices]
 
         # Test different k values
         k_values = [5, 10, 20]
         performance = {}
 
+        # Untimed warmup so the first measurement excludes one-off setup
+        # (GPU context/kernel loading, page faults on the index)
+        index.search(test_queries[:1], k_values[0])
+
         for k in k_values:
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
 
             # Perform search
             distances, indices = index.search(test_queries, k)
 
-            search_time = (datetime.now() - start_time).total_seconds()
-            avg_time_per_query = search_time / num_queries * 1000  # ms
+            search_time_ns = time.perf_counter_ns() - start_ns
+            avg_time_per_query = search_time_ns / num_queries / 1e6  # ms
 
             performance[f'search_time_k{k}_ms'] = avg_time_per_query
 
             logger.info(f"K={k}: {avg_time_per_query:.2f}ms per query")
 
-        # Test recall (for IVF indexes)
-        if hasattr(index, 'nprobe'):
-            recall = self._test_recall(index, embeddings, test_queries)
+        # Test recall (for IVF indexes); a flat index is already exact
+        if hasattr(index, 'nprobe') or faiss.try_extract_index_ivf(index) is not None:
+            if exact_indices is None:
+                k = 10
+                num_test = min(20, num_queries)  # Test on subset
+
+                # Brute-force GEMM top-k; no exact index (and copy of the
+                # embeddings) is built just for ground truth
+                queries = test_queries[:num_test]
+                if self._gpu_res is not None:
+                    _, exact_indices = faiss.knn_gpu(
+                        self._gpu_res, queries, embeddings, k, metric=faiss.METRIC_INNER_PRODUCT
+                    )
+                else:
+                    _, exact_indices = faiss.knn(
+                        queries, embeddings, k, metric=faiss.METRIC_INNER_PRODUCT
+                    )
+
+                self._save_exact_topk(cache_path, query_indices, exact_indices)
+            else:
+                logger.info(f"Using cached exact top-k from {cache_path}")
+
+            recall = self._test_recall(index, test_queries, exact_indices)
             performance['recall@10'] = recall
 
         return performance
 
-    def _test_recall(self, index: faiss.Index, embeddings: np.ndarray, test_queries: np.ndarray) -> float:
-        """Test recall for approximate index."""
-        logger.info("Testing recall against exact search...")
+    def _exact_topk_cache_path(self, embeddings: np.ndarray) -> str:
+        """Path of the cached exact top-k, keyed by a hash of the embeddings."""
+        # Hashing every vector is far cheaper than the exact search it saves,
+        # and a change anywhere in the matrix must invalidate the cache
+        digest = hashlib.blake2b(np.ascontiguousarray(embeddings), digest_size=16).hexdigest()
+        key = f"{digest}{len(embeddings)}"
+        return os.path.join(Config.FAISS_INDEX_PATH, f"exact_topk_{key}.npz")
 
-        # Build exact index for ground truth
-        exact_index = faiss.IndexFlatIP(embeddings.shape[1])
-        exact_index.add(embeddings)
+    def _load_exact_topk(
+        self,
+        cache_path: str,
+        num_vectors: int
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Load cached (query_indices, exact_indices), or (None, None) if unusable."""
+        if not os.path.exists(cache_path):
+            return None, None
 
-        k = 10
-        num_test = min(20, len(test_queries))  # Test on subset
+        try:
+            with np.load(cache_path) as cached:
+                query_indices = cached['query_indices']
+                exact_indices = cached['exact_indices']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable exact top-k cache {cache_path}: {e}")
+            return None, None
 
-        recalls = []
+        if query_indices.size == 0 or query_indices.max() >= num_vectors:
+            return None, None
 
-        for i in range(num_test):
-            query = test_queries[i:i+1]
+        return query_indices, exact_indices
 
-            # Get approximate results
-            _, approx_indices = index.search(query, k)
+    def _save_exact_topk(self, cache_path: str, query_indices: np.ndarray, exact_indices: np.ndarray):
+        """Cache the exact top-k together with the query indices it was computed for."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path + ".tmp", 'wb') as f:
+                np.savez(f, query_indices=query_indices, exact_indices=exact_indices)
+            _commit_file(cache_path + ".tmp", cache_path)
+
+            # Only the current embeddings' result is ever read again
+            cache_dir = os.path.dirname(cache_path)
+            for name in os.listdir(cache_dir):
+                stale_path = os.path.join(cache_dir, name)
+                if name.startswith("exact_topk_") and name.endswith(".npz") and stale_path != cache_path:
+                    os.remove(stale_path)
+        except OSError as e:
+            logger.warning(f"Could not cache exact top-k to {cache_path}: {e}")
+
+    def _test_recall(
+        self,
+        index: faiss.Index,
+        test_queries: np.ndarray,
+        exact_indices: np.ndarray
+    ) -> float:
+        """
+        Test recall for approximate index.
 
-            # Get exact results
-            _, exact_indices = exact_index.search(query, k)
+        Args:
+            index: Approximate index under test
+            test_queries: Query vectors; the first len(exact_indices) are used
+            exact_indices: Exact top-k ids for those queries (ground truth)
 
-            # Calculate recall
-            approx_set = set(approx_indices[0])
-            exact_set = set(exact_indices[0])
+        Returns:
+            Average recall@k
+        """
+        logger.info("Testing recall against exact search...")
 
-            recall = len(approx_set & exact_set) / k
-            recalls.append(recall)
+        num_test, k = exact_indices.shape
+        queries = test_queries[:num_test]
 
-        avg_recall = np.mean(recalls)
+        # One batched search for the whole query subset
+        _, approx_indices = index.search(queries, k)
+
+        # Calculate recall: per-row membership via broadcasting (k x k per query).
+        # A flat np.isin would match against every query's ground truth at once.
+        found = (approx_indices[:, :, None] == exact_indices[:, None, :]).any(axis=2)
+        recalls = found.mean(axis=1, dtype=np.float32)
+
+        avg_recall = float(recalls.mean())
         logger.info(f"Average Recall@{k}: {avg_recall:.3f}")
 
         return avg_recall
 
-    def _estimate_index_size(self, index: faiss.Index) -> float:
-        """Estimate index size in MB."""
-        # Rough estimation based on index type and parameters
-        if hasattr(index, 'ntotal'):
-            num_vectors = index.ntotal
-        else:
-            num_vectors = 0
+    def _projected_index_size_mb(self, index_type: str, shape: Tuple[int, int]) -> float:
+        """Projected size in MB of a flat or IVF index over `shape` vectors, before building it."""
+        num_vectors, dimension = shape
+
+        if index_type == "flat":
+            code_size = faiss.IndexFlatIP(dimension).sa_code_size()
+            return num_vectors * code_size / (1024 * 1024)
+
+        sq_type = getattr(faiss.ScalarQuantizer, Config.FAISS_SQ_TYPE)
+        code_size = faiss.IndexScalarQuantizer(dimension, sq_type).sa_code_size()
+        nlist = min(Config.FAISS_NLIST, num_vectors // 10)
 
-        dimension = index.d if hasattr(index, 'd') else 512
+        # Codes plus one int64 id per vector, and the float32 centroids
+        return (num_vectors * (code_size + 8) + nlist * dimension * 4) / (1024 * 1024)
 
-        # Estimate: 4 bytes per float + overhead
-        estimated_bytes = num_vectors * dimension * 4 * 1.2  # 20% overhead
-        return estimated_bytes / (1024 * 1024)  # Convert to MB
+    def _to_cpu(self, index: faiss.Index) -> faiss.Index:
+        """Return a CPU copy of a GPU index, or the index itself if it is on CPU."""
+        if self._gpu_res is not None and not isinstance(index, faiss.IndexPreTransform):
+            return faiss.index_gpu_to_cpu(index)
+        return index
+
+    def _index_file_size_mb(self, index_path: str) -> float:
+        """Index size in MB, taken from the file it was just saved to."""
+        return os.path.getsize(index_path) / (1024 * 1024)
 
     def _save_index_and_metadata(
         self,
@@ -310,8 +539,8 @@ class FAISSIndexBuilder:
         track_ids: List[str],
         index_type: str,
         performance_metrics: Dict
-    ):
-        """Save index and associated metadata."""
+    ) -> str:
+        """Save index and associated metadata, returning the index file path."""
         logger.info("💾 Saving index and metadata...")
 
         # Ensure output directory exists
@@ -321,24 +550,17 @@ class FAISSIndexBuilder:
         index_path = os.path.join(Config.FAISS_INDEX_PATH, "audio_embeddings.index")
 
         # Move to CPU before saving if on GPU
-        if hasattr(index, 'index'):  # GPU index wrapper
-            cpu_index = faiss.index_gpu_to_cpu(index)
-            faiss.write_index(cpu_index, index_path)
-        else:
-            faiss.write_index(index, index_path)
+        faiss.write_index(self._to_cpu(index), index_path + ".tmp")
+        _commit_file(index_path + ".tmp", index_path)
 
         logger.info(f"Index saved to: {index_path}")
 
-        # Save track ID mapping
-        import pickle
-        mapping_path = os.path.join(Config.FAISS_INDEX_PATH, "track_id_mapping.pkl")
-        with open(mapping_path, 'wb') as f:
-            pickle.dump({
-                'track_ids': track_ids,
-                'index_type': index_type,
-                'build_date': datetime.now().isoformat(),
-                'performance_metrics': performance_metrics
-            }, f)
+        # Save track ID mapping as fixed-width UUID bytes (row i = FAISS id i)
+        mapping_path = os.path.join(Config.FAISS_INDEX_PATH, "track_id_mapping.npy")
+        id_bytes = b''.join(UUID(str(track_id)).bytes for track_id in track_ids)
+        with open(mapping_path + ".tmp", 'wb') as f:
+            np.save(f, np.frombuffer(id_bytes, dtype=np.uint8).reshape(len(track_ids), 16))
+        _commit_file(mapping_path + ".tmp", mapping_path)
 
         logger.info(f"Track mapping saved to: {mapping_path}")
 
@@ -352,15 +574,21 @@ class FAISSIndexBuilder:
             'gpu_enabled': self.use_gpu,
             'performance_metrics': performance_metrics,
             'index_file': 'audio_embeddings.index',
-            'mapping_file': 'track_id_mapping.pkl'
+            'mapping_file': 'track_id_mapping.npy',
+            # Readers should memory-map rather than copy the index into RAM,
+            # e.g. utils.similarity.load_faiss_index
+            'read_io_flags': 'IO_FLAG_MMAP|IO_FLAG_READ_ONLY'
         }
 
         import json
-        with open(metadata_path, 'w') as f:
+        with open(metadata_path + ".tmp", 'w') as f:
             json.dump(metadata, f, indent=2)
+        _commit_file(metadata_path + ".tmp", metadata_path)
 
         logger.info(f"Metadata saved to: {metadata_path}")
 
+        return index_path
+
     def _generate_build_summary(self, main_result: Dict) -> Dict:
         """Generate build summary."""
         duration = datetime.now() - self.start_time
@@ -391,7 +619,7 @@ async def main():
     )
     parser.add_argument(
         '--index-type',
-        choices=['flat', 'ivf', 'auto'],
+        choices=['flat', 'ivf', 'pq', 'auto'],
         default='auto',
         help='Type of index to build (default: auto)'
     )
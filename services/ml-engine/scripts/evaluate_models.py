@@ -94,13 +94,21 @@ class EvaluationRunner:
         if not test_data:
             raise ValueError("No test data available for evaluation")
 
+        # Load all model files concurrently; unpickling/torch.load is blocking IO
+        loop = asyncio.get_running_loop()
+        loaded = await asyncio.gather(
+            *[loop.run_in_executor(None, self._load_model_sync, name) for name in model_names],
+            return_exceptions=True
+        )
+
         results = {}
 
-        for model_name in model_names:
+        for model_name, model in zip(model_names, loaded):
             logger.info(f"Evaluating {model_name}...")
 
             try:
-                model = await self._load_model(model_name)
+                if isinstance(model, Exception):
+                    raise model
                 if model:
                     evaluation = await self.evaluator.evaluate_model(
                         model, model_name, test_data
@@ -117,8 +125,8 @@ class EvaluationRunner:
 
         return results
 
-    async def _load_model(self, model_name: str):
-        """Load a specific model by name."""
+    def _load_model_sync(self, model_name: str):
+        """Load a specific model by name (blocking; run in an executor)."""
         model_path_map = {
             'collaborative_filter': os.path.join(Config.MODEL_SAVE_PATH, "free", "collaborative_filter_als.pkl"),
             'popularity': os.path.join(Config.MODEL_SAVE_PATH, "free", "popularity.pkl"),
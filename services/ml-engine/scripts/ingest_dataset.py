@@ -15,6 +15,7 @@ Usage:
 
 Examples:
     python scripts/ingest_dataset.py fma --subset small --extract-features
+    python scripts/ingest_dataset.py fma --subset medium --bulk-mode
     python scripts/ingest_dataset.py spotify --tracks 1000 --extract-features
     python scripts/ingest_dataset.py musicbrainz --artists "The Beatles"
 """
@@ -24,17 +25,26 @@ import argparse
 import sys
 import os
 import logging
+import shutil
+import csv
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 import zipfile
-import requests
+import aiohttp
+import asyncpg
+import orjson
 from pathlib import Path
 
+try:
+    import pandas as pd
+except ImportError:  # Only needed for FMA metadata processing
+    pd = None
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
-from utils.db import get_db_connection
+from utils.db import get_db_pool
 
 
 # Configure logging
@@ -45,12 +55,98 @@ logging.basicConfig(
 
 logger = logging.getLogger("ingest_dataset")
 
+# Download chunk size for streamed HTTP responses, and progress log interval
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_LOG_INTERVAL = 10 * DOWNLOAD_CHUNK_SIZE
+
+# Concurrent HTTP Range requests per archive download
+DOWNLOAD_PARTS = 8
+
+# Spotify search page size (API maximum), deepest reachable result
+# (offset + limit may not exceed it) and concurrent request limit
+SPOTIFY_PAGE_SIZE = 50
+SPOTIFY_MAX_SEARCH_RESULTS = 1000
+SPOTIFY_MAX_CONCURRENT_REQUESTS = 8
+
+# tracks.csv rows parsed per chunk; each chunk is loaded before the next is read
+CSV_CHUNK_SIZE = 20_000
+
+# Parsed tracks.csv chunks buffered between the parser and the DB loader
+METADATA_QUEUE_SIZE = 4
+
+# Rows per COPY/transaction; PostgreSQL bulk-load throughput plateaus
+# around 10k rows while larger batches only add memory and WAL pressure
+BATCH_SIZE = 10_000
+
+
+async def _init_json_codecs(conn: asyncpg.Connection):
+    """
+    Encode json/jsonb parameters with orjson straight to the binary wire format.
+
+    Records can then carry plain dicts: each value is serialized exactly once,
+    to bytes, while COPY encodes the row.
+    """
+    await conn.set_type_codec(
+        'json', encoder=orjson.dumps, decoder=orjson.loads,
+        schema='pg_catalog', format='binary'
+    )
+    # Binary jsonb is a version byte followed by the JSON text
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=lambda value: b'\x01' + orjson.dumps(value),
+        decoder=lambda data: orjson.loads(data[1:]),
+        schema='pg_catalog', format='binary'
+    )
+
+
+def fma_audio_member(subset: str, track_id) -> str:
+    """
+    Name of a track's MP3 inside an FMA audio archive.
+
+    The archive is kept unextracted; open single tracks on demand with
+    ``zipfile.ZipFile(archive).open(fma_audio_member(subset, track_id))``.
+    """
+    tid = f"{int(track_id):06d}"
+    return f"fma_{subset}/{tid[:3]}/{tid}.mp3"
+
+
+async def _aiter_chunks(chunks: Iterable) -> AsyncIterator:
+    """Adapt a plain iterable of record chunks to the async interface of the bulk loader."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def _drain_queue(queue: asyncio.Queue) -> AsyncIterator:
+    """Yield items from queue until the producer's None sentinel."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        yield item
+
+
+async def _gather_or_cancel(*aws) -> List:
+    """
+    Like asyncio.gather, but if one awaitable fails the others are cancelled
+    and awaited before the error propagates, so none of them outlives the
+    resources (sessions, file descriptors) the caller is about to release.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class DatasetIngester:
     """Base class for dataset ingestion."""
 
-    def __init__(self, extract_features: bool = False):
+    def __init__(self, extract_features: bool = False, bulk_mode: bool = False):
         self.extract_features = extract_features
+        self.bulk_mode = bulk_mode
         self.start_time = datetime.now()
         self.ingested_tracks = 0
         self.failed_tracks = 0
@@ -59,12 +155,173 @@ class DatasetIngester:
         """Override in subclasses."""
         raise NotImplementedError
 
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session shared by every request of one ingestion run."""
+        return aiohttp.ClientSession(
+            # No total timeout: dataset archives take minutes to stream
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=300),
+            connector=aiohttp.TCPConnector(limit=16)
+        )
+
+    async def _bulk_insert_tracks(
+        self,
+        pool: asyncpg.Pool,
+        columns: List[str],
+        record_chunks: AsyncIterator[List[Tuple]]
+    ) -> int:
+        """
+        Insert track records in bulk, skipping tracks that already exist.
+
+        Records are loaded in BATCH_SIZE slices, each in its own transaction
+        on its own pooled connection, so batches overlap their network I/O
+        and the whole load costs a constant number of round-trips per batch
+        instead of two per track. Duplicates are resolved by the database
+        against the unique (source, external_id) index.
+
+        In bulk mode, secondary indexes on ``tracks`` are dropped for the
+        load and rebuilt afterwards, and batches commit without waiting for
+        the WAL flush.
+
+        Args:
+            pool: Database connection pool
+            columns: ``tracks`` columns, in record order (must include source and external_id)
+            record_chunks: Async iterator over lists of tuples of column
+                values; each chunk is loaded before the next is requested
+
+        Returns:
+            Number of tracks inserted
+        """
+        await self._check_dedup_index(pool)
+
+        dropped_indexes = await self._drop_secondary_indexes(pool) if self.bulk_mode else []
+
+        inserted = 0
+        processed = 0
+
+        try:
+            async for records in record_chunks:
+                # Concurrency is bounded by the pool size
+                batch_counts = await asyncio.gather(*[
+                    self._insert_track_batch(
+                        pool, columns, records[start:start + BATCH_SIZE], processed + start
+                    )
+                    for start in range(0, len(records), BATCH_SIZE)
+                ])
+
+                inserted += sum(batch_counts)
+                processed += len(records)
+        finally:
+            await self._restore_indexes(pool, dropped_indexes)
+
+        return inserted
+
+    async def _drop_secondary_indexes(self, pool: asyncpg.Pool) -> List[str]:
+        """
+        Drop the non-unique indexes on ``tracks`` before a bulk load.
+
+        Primary key and unique indexes are kept, since ON CONFLICT relies on
+        them.
+
+        Returns:
+            CREATE INDEX statements to restore the dropped indexes
+        """
+        rows = await pool.fetch("""
+            SELECT
+                quote_ident(n.nspname) || '.' || quote_ident(c.relname) AS name,
+                pg_get_indexdef(ix.indexrelid) AS definition
+            FROM pg_index ix
+            JOIN pg_class c ON c.oid = ix.indexrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE ix.indrelid = 'tracks'::regclass
+              AND NOT ix.indisprimary
+              AND NOT ix.indisunique
+        """)
+
+        for row in rows:
+            await pool.execute(f"DROP INDEX IF EXISTS {row['name']}")
+
+        logger.info(f"Bulk mode: dropped {len(rows)} secondary indexes on tracks")
+        return [row['definition'] for row in rows]
+
+    async def _restore_indexes(self, pool: asyncpg.Pool, definitions: List[str]):
+        """Recreate indexes dropped for a bulk load, without blocking writes."""
+        for definition in definitions:
+            await pool.execute(
+                definition.replace('CREATE INDEX ', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ', 1)
+            )
+
+        if definitions:
+            logger.info(f"Bulk mode: rebuilt {len(definitions)} indexes on tracks")
+
+    async def _check_dedup_index(self, pool: asyncpg.Pool):
+        """
+        Fail early if the unique (source, external_id) index ON CONFLICT dedups against is missing.
+
+        The columns and index are created by the API's Alembic migrations,
+        not by this script.
+        """
+        exists = await pool.fetchval(
+            "SELECT to_regclass('tracks_source_extid_uk') IS NOT NULL"
+        )
+        if not exists:
+            raise RuntimeError(
+                "tracks_source_extid_uk index is missing; run the API migrations "
+                "(make migrate) before ingesting"
+            )
+
+    async def _insert_track_batch(
+        self,
+        pool: asyncpg.Pool,
+        columns: List[str],
+        records: List[Tuple],
+        start: int
+    ) -> int:
+        """
+        Insert one batch of track records.
+
+        Records are COPYed into a temporary staging table and moved into
+        ``tracks`` with a single INSERT ... SELECT ... ON CONFLICT DO NOTHING,
+        which skips rows whose (source, external_id) is already present.
+
+        Returns:
+            Number of tracks inserted
+        """
+        column_list = ', '.join(columns)
+
+        async with pool.acquire() as conn, conn.transaction():
+            if self.bulk_mode:
+                await conn.execute("SET LOCAL synchronous_commit = off")
+
+            await conn.execute(f"""
+                CREATE TEMP TABLE _incoming_tracks ON COMMIT DROP AS
+                SELECT {column_list} FROM tracks WITH NO DATA
+            """)
+
+            await conn.copy_records_to_table(
+                '_incoming_tracks', records=records, columns=columns
+            )
+
+            status = await conn.execute(f"""
+                INSERT INTO tracks ({column_list})
+                SELECT {column_list} FROM _incoming_tracks
+                ON CONFLICT (source, external_id) DO NOTHING
+            """)
+
+        # Command status is "INSERT 0 <rows>"
+        inserted = int(status.split()[-1])
+
+        logger.info(
+            f"Batch {start // BATCH_SIZE + 1}: inserted {inserted}/{len(records)} tracks "
+            f"(rows {start}-{start + len(records) - 1})"
+        )
+        return inserted
+
 
 class FMAIngester(DatasetIngester):
     """Free Music Archive dataset ingester."""
 
-    def __init__(self, extract_features: bool = False):
-        super().__init__(extract_features)
+    def __init__(self, extract_features: bool = False, bulk_mode: bool = False):
+        super().__init__(extract_features, bulk_mode)
         self.fma_urls = {
             'small': 'https://os.unil.cloud.switch.ch/fma/fma_small.zip',
             'medium': 'https://os.unil.cloud.switch.ch/fma/fma_medium.zip',
@@ -89,15 +346,16 @@ class FMAIngester(DatasetIngester):
             data_dir = Path(data_dir)
             data_dir.mkdir(parents=True, exist_ok=True)
 
-            # Download and extract dataset
-            dataset_path = await self._download_fma_dataset(subset, data_dir)
-            metadata_path = await self._download_fma_metadata(data_dir)
-
-            # Process metadata
-            tracks_metadata = self._process_fma_metadata(metadata_path)
+            async with self._http_session() as session:
+                # Metadata is small and needed first
+                metadata_path = await self._download_fma_metadata(session, data_dir)
 
-            # Ingest tracks to database
-            await self._ingest_tracks_to_db(tracks_metadata, dataset_path)
+                # Ingesting track metadata doesn't need the audio, so it runs
+                # while the (multi-GB) audio archive downloads
+                audio_archive, _ = await _gather_or_cancel(
+                    self._download_fma_dataset(session, subset, data_dir),
+                    self._ingest_metadata(metadata_path)
+                )
 
             duration = datetime.now() - self.start_time
 
@@ -108,6 +366,7 @@ class FMAIngester(DatasetIngester):
                 'failed_tracks': self.failed_tracks,
                 'duration_seconds': duration.total_seconds(),
                 'data_directory': str(data_dir),
+                'audio_archive': str(audio_archive),
                 'status': 'success'
             }
 
@@ -122,52 +381,140 @@ class FMAIngester(DatasetIngester):
                 'error': str(e)
             }
 
-    async def _download_fma_dataset(self, subset: str, data_dir: Path) -> Path:
-        """Download FMA dataset."""
+    async def _download_fma_dataset(
+        self,
+        session: aiohttp.ClientSession,
+        subset: str,
+        data_dir: Path
+    ) -> Path:
+        """
+        Download the FMA audio archive.
+
+        The archive is not extracted: only the tracks actually used are read,
+        member by member, via fma_audio_member, which avoids writing (and
+        storing twice) every file of a multi-GB archive.
+        """
         if subset not in self.fma_urls:
             raise ValueError(f"Unknown FMA subset: {subset}")
 
         url = self.fma_urls[subset]
-        filename = f"fma_{subset}.zip"
-        file_path = data_dir / filename
-        extract_path = data_dir / f"fma_{subset}"
+        file_path = data_dir / f"fma_{subset}.zip"
 
-        # Check if already downloaded
-        if extract_path.exists() and any(extract_path.iterdir()):
-            logger.info(f"FMA {subset} already exists at {extract_path}")
-            return extract_path
+        # Check if already downloaded; _download_file only puts the archive at
+        # file_path once every byte has arrived
+        if file_path.exists():
+            logger.info(f"FMA {subset} already exists at {file_path}")
+            return file_path
 
         logger.info(f"Downloading FMA {subset} from {url}...")
 
         # Download file
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        await self._download_file(session, url, file_path)
+
+        logger.info(f"Download completed: {file_path}")
+        return file_path
+
+    async def _download_file(self, session: aiohttp.ClientSession, url: str, file_path: Path):
+        """
+        Download url to file_path.
+
+        If the server supports byte ranges, the file is split into
+        DOWNLOAD_PARTS ranges fetched over parallel connections, each written
+        at its own offset of a preallocated file; otherwise it is streamed
+        over a single connection. Either way the data goes to a ``.part``
+        file that is renamed to file_path only after the whole download
+        succeeded, so file_path never holds a partial download.
+        """
+        part_path = file_path.with_name(file_path.name + '.part')
+
+        # HEAD only decides whether ranged download is possible; servers that
+        # reject it (or omit the headers) still get a single-stream GET
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get('content-length', 0))
+                accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        except aiohttp.ClientError as e:
+            logger.info(f"HEAD request failed ({e}); downloading over a single connection")
+            total_size = 0
+            accepts_ranges = False
 
-        total_size = int(response.headers.get('content-length', 0))
         downloaded = 0
+        next_log = DOWNLOAD_LOG_INTERVAL
 
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
+        def report(num_bytes: int):
+            nonlocal downloaded, next_log
+            downloaded += num_bytes
 
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        if downloaded % (1024 * 1024 * 10) == 0:  # Log every 10MB
-                            logger.info(f"Download progress: {progress:.1f}%")
+            # Log each time another 10MB has arrived; chunk sizes vary, so
+            # compare against a threshold rather than an exact multiple
+            if total_size > 0 and downloaded >= next_log:
+                progress = (downloaded / total_size) * 100
+                logger.info(f"Download progress: {progress:.1f}%")
+                next_log += DOWNLOAD_LOG_INTERVAL
 
-        logger.info(f"Download completed: {file_path}")
+        if not accepts_ranges or total_size < DOWNLOAD_PARTS * DOWNLOAD_CHUNK_SIZE:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                total_size = total_size or response.content_length or 0
 
-        # Extract archive
-        logger.info(f"Extracting {filename}...")
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(data_dir)
+                with open(part_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        report(len(chunk))
 
-        logger.info(f"Extraction completed: {extract_path}")
-        return extract_path
+            os.replace(part_path, file_path)
+            return
+
+        part_size = -(-total_size // DOWNLOAD_PARTS)
+        logger.info(f"Downloading {total_size} bytes in {DOWNLOAD_PARTS} parallel ranges")
 
-    async def _download_fma_metadata(self, data_dir: Path) -> Path:
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, total_size)
+            else:
+                os.ftruncate(fd, total_size)
+
+            # Ranges still writing must stop before fd is closed below
+            await _gather_or_cancel(*[
+                self._download_range(
+                    session, url, fd, start, min(start + part_size, total_size) - 1, report
+                )
+                for start in range(0, total_size, part_size)
+            ])
+        finally:
+            os.close(fd)
+
+        os.replace(part_path, file_path)
+
+    async def _download_range(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        fd: int,
+        start: int,
+        end: int,
+        report
+    ):
+        """Fetch bytes start..end (inclusive) of url and write them at the same offset of fd."""
+        headers = {'Range': f'bytes={start}-{end}'}
+
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status != 206:
+                raise OSError(f"Server ignored Range request for {url}")
+
+            offset = start
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                report(len(chunk))
+
+        if offset != end + 1:
+            raise OSError(f"Incomplete range {start}-{end} for {url}: got {offset - start} bytes")
+
+    async def _download_fma_metadata(self, session: aiohttp.ClientSession, data_dir: Path) -> Path:
         """Download FMA metadata."""
         url = self.fma_urls['metadata']
         filename = "fma_metadata.zip"
@@ -180,136 +527,210 @@ class FMAIngester(DatasetIngester):
 
         logger.info("Downloading FMA metadata...")
 
-        response = requests.get(url)
-        response.raise_for_status()
-
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
+        await self._download_file(session, url, file_path)
 
         # Extract metadata
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(data_dir)
+        self._extract_zip(file_path, data_dir)
 
         return extract_path
 
-    def _process_fma_metadata(self, metadata_path: Path) -> List[Dict]:
-        """Process FMA metadata CSV files."""
+    def _extract_zip(self, file_path: Path, data_dir: Path):
+        """
+        Extract a zip archive member by member, then delete the archive.
+
+        Each member is streamed to disk through a bounded 1MB buffer, so peak
+        memory stays constant regardless of archive or member size.
+        """
+        root = data_dir.resolve()
+
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                target = (data_dir / info.filename).resolve()
+                if root not in target.parents:
+                    logger.warning(f"Skipping zip member outside {data_dir}: {info.filename}")
+                    continue
+
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+
+        file_path.unlink()
+
+    def _process_fma_metadata(self, metadata_path: Path) -> Iterator[List[Dict]]:
+        """
+        Process FMA metadata CSV files.
+
+        tracks.csv is streamed in CSV_CHUNK_SIZE-row chunks, reading only the
+        columns used here, and yields the track metadata of one chunk at a time.
+        """
         logger.info("Processing FMA metadata...")
 
-        try:
-            import pandas as pd
-        except ImportError:
+        if pd is None:
             logger.error("pandas is required for FMA metadata processing")
-            raise
+            raise ImportError("pandas is required for FMA metadata processing")
 
         # Load tracks metadata
         tracks_file = metadata_path / "tracks.csv"
         if not tracks_file.exists():
             raise FileNotFoundError(f"Tracks metadata not found: {tracks_file}")
 
-        # Read CSV with multi-level headers
-        tracks_df = pd.read_csv(tracks_file, index_col=0, header=[0, 1])
-
-        tracks_metadata = []
-
-        for track_id, row in tracks_df.iterrows():
-            try:
-                # Extract basic track information
-                track_data = {
-                    'external_id': str(track_id),
-                    'title': self._safe_get(row, ('track', 'title')),
-                    'artist': self._safe_get(row, ('artist', 'name')),
-                    'album': self._safe_get(row, ('album', 'title')),
-                    'genre': self._safe_get(row, ('track', 'genre_top')),
-                    'duration_seconds': self._safe_get(row, ('track', 'duration')),
-                    'release_year': None,  # Not directly available in FMA
-                    'source': 'FMA',
-                    'license': self._safe_get(row, ('track', 'license')),
-                }
-
-                tracks_metadata.append(track_data)
-
-            except Exception as e:
-                logger.debug(f"Failed to process track {track_id}: {e}")
-                continue
+        columns = {
+            ('track', 'title'): 'title',
+            ('artist', 'name'): 'artist',
+            ('album', 'title'): 'album',
+            ('track', 'genre_top'): 'genre',
+            ('track', 'duration'): 'duration_seconds',
+            ('track', 'license'): 'license',
+        }
+
+        # pandas rejects usecols together with a multi-level header, so read
+        # the two header rows (section, field) by hand and parse the data rows
+        # positionally. The third header row only holds the index name.
+        # Position 0 is the track_id column.
+        with open(tracks_file, newline='', encoding='utf-8') as f:
+            header_rows = csv.reader(f)
+            sections, fields = next(header_rows), next(header_rows)
+
+        positions = {column: pos for pos, column in enumerate(zip(sections, fields)) if pos > 0}
+        names = {0: 'external_id'}
+        names.update((positions[column], name) for column, name in columns.items() if column in positions)
+
+        reader = pd.read_csv(
+            tracks_file, header=None, skiprows=3,
+            usecols=sorted(names), chunksize=CSV_CHUNK_SIZE
+        )
+
+        processed = 0
+
+        for tracks_df in reader:
+            tracks_df = tracks_df.rename(columns=names)
 
-        logger.info(f"Processed metadata for {len(tracks_metadata)} tracks")
-        return tracks_metadata
+            # Columns missing from the file become all-None, and values are
+            # stringified like the raw CSV
+            selected = tracks_df.reindex(columns=['external_id', *columns.values()])
+            selected = selected.astype(str).astype(object).where(selected.notna(), None)
+
+            selected['release_year'] = None  # Not directly available in FMA
+            selected['source'] = 'FMA'
+
+            tracks_metadata = selected.to_dict('records')
+            processed += len(tracks_metadata)
+
+            # Release this chunk's frames before suspending; the generator
+            # would otherwise pin them while the consumer loads the batch
+            del tracks_df, selected
+
+            yield tracks_metadata
+
+        logger.info(f"Processed metadata for {processed} tracks")
+
+    async def _ingest_metadata(self, metadata_path: Path):
+        """
+        Parse tracks.csv and load it into the database as a pipeline.
+
+        A producer parses CSV chunks in a worker thread and hands them over a
+        bounded queue, so parsing the next chunk overlaps the COPY of the
+        previous one and never blocks the event loop.
+        """
+        queue = asyncio.Queue(maxsize=METADATA_QUEUE_SIZE)
+        producer = asyncio.create_task(self._produce_metadata_chunks(metadata_path, queue))
 
-    def _safe_get(self, row, key_path):
-        """Safely get value from multi-level DataFrame row."""
         try:
-            value = row[key_path]
-            return str(value) if pd.notna(value) else None
-        except (KeyError, IndexError):
-            return None
+            await self._ingest_tracks_to_db(_drain_queue(queue))
+        finally:
+            # A no-op once the consumer has reached the sentinel, since the
+            # producer finishes right after enqueueing it
+            producer.cancel()
+
+        if producer.done():
+            producer.result()  # Surface parse errors
 
-    async def _ingest_tracks_to_db(self, tracks_metadata: List[Dict], audio_path: Path):
-        """Ingest tracks to database."""
+    async def _produce_metadata_chunks(self, metadata_path: Path, queue: asyncio.Queue):
+        """Feed parsed metadata chunks into queue, ending with a None sentinel."""
+        loop = asyncio.get_running_loop()
+        metadata_chunks = self._process_fma_metadata(metadata_path)
+
+        try:
+            while True:
+                tracks_metadata = await loop.run_in_executor(None, next, metadata_chunks, None)
+                if tracks_metadata is None:
+                    break
+                await queue.put(tracks_metadata)
+        finally:
+            await queue.put(None)
+
+    async def _ingest_tracks_to_db(self, metadata_chunks: AsyncIterator[List[Dict]]):
+        """Ingest tracks to database, one metadata chunk at a time."""
         logger.info("Ingesting tracks to database...")
 
-        conn = await get_db_connection()
+        pool = await get_db_pool(init=_init_json_codecs)
 
         try:
             # Get default organization (assuming one exists)
-            org_result = await conn.fetchrow("SELECT id FROM organizations LIMIT 1")
+            org_result = await pool.fetchrow("SELECT id FROM organizations LIMIT 1")
             if not org_result:
                 logger.error("No organization found. Please create an organization first.")
                 return
 
             org_id = org_result['id']
 
-            for track_data in tracks_metadata:
-                try:
-                    # Check if track already exists
-                    existing = await conn.fetchrow(
-                        "SELECT id FROM tracks WHERE title = $1 AND artist = $2",
-                        track_data['title'], track_data['artist']
-                    )
+            record_chunks = (
+                self._fma_records(org_id, tracks_metadata)
+                async for tracks_metadata in metadata_chunks
+            )
 
-                    if existing:
-                        logger.debug(f"Track already exists: {track_data['title']}")
-                        continue
-
-                    # Insert track
-                    track_id = await conn.fetchval("""
-                        INSERT INTO tracks (
-                            org_id, title, artist, album, genre,
-                            duration_seconds, extra_metadata
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-                        RETURNING id
-                    """,
-                        org_id,
-                        track_data['title'],
-                        track_data['artist'],
-                        track_data['album'],
-                        track_data['genre'],
-                        track_data['duration_seconds'],
-                        {
-                            'source': track_data['source'],
-                            'external_id': track_data['external_id'],
-                            'license': track_data['license']
-                        }
-                    )
+            self.ingested_tracks += await self._bulk_insert_tracks(
+                pool,
+                ['org_id', 'title', 'artist', 'album', 'genre',
+                 'duration_seconds', 'source', 'external_id', 'extra_metadata'],
+                record_chunks
+            )
 
-                    self.ingested_tracks += 1
+            logger.info(f"Ingested {self.ingested_tracks} tracks...")
 
-                    if self.ingested_tracks % 100 == 0:
-                        logger.info(f"Ingested {self.ingested_tracks} tracks...")
+        finally:
+            await pool.close()
 
-                except Exception as e:
-                    logger.debug(f"Failed to ingest track {track_data['title']}: {e}")
-                    self.failed_tracks += 1
+    def _fma_records(self, org_id, tracks_metadata: List[Dict]) -> List[Tuple]:
+        """Convert FMA track metadata to ``tracks`` COPY records."""
+        records = []
+        for track_data in tracks_metadata:
+            if not track_data['title']:
+                continue
 
-        finally:
-            await conn.close()
+            duration = track_data['duration_seconds']
+
+            records.append((
+                org_id,
+                track_data['title'],
+                track_data['artist'],
+                track_data['album'],
+                track_data['genre'],
+                int(float(duration)) if duration is not None else None,
+                track_data['source'],
+                track_data['external_id'],
+                {'license': track_data['license']}
+            ))
+
+        # One counter update and log line per chunk rather than per skipped row
+        skipped = len(tracks_metadata) - len(records)
+        if skipped:
+            self.failed_tracks += skipped
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Skipped {skipped} FMA tracks without a title")
+
+        return records
 
 
 class SpotifyIngester(DatasetIngester):
     """Spotify Web API dataset ingester."""
 
-    def __init__(self, extract_features: bool = False):
-        super().__init__(extract_features)
+    def __init__(self, extract_features: bool = False, bulk_mode: bool = False):
+        super().__init__(extract_features, bulk_mode)
         self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
         self.client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
 
@@ -337,14 +758,15 @@ class SpotifyIngester(DatasetIngester):
             }
 
         try:
-            # Get access token
-            access_token = await self._get_spotify_token()
+            async with self._http_session() as session:
+                # Get access token
+                access_token = await self._get_spotify_token(session)
 
-            # Get tracks (either from playlists or search)
-            if playlists:
-                track_data = await self._get_tracks_from_playlists(access_token, playlists)
-            else:
-                track_data = await self._search_tracks(access_token, tracks)
+                # Get tracks (either from playlists or search)
+                if playlists:
+                    track_data = await self._get_tracks_from_playlists(session, access_token, playlists)
+                else:
+                    track_data = await self._search_tracks(session, access_token, tracks)
 
             # Ingest to database
             await self._ingest_spotify_tracks(track_data)
@@ -370,7 +792,7 @@ class SpotifyIngester(DatasetIngester):
                 'error': str(e)
             }
 
-    async def _get_spotify_token(self) -> str:
+    async def _get_spotify_token(self, session: aiohttp.ClientSession) -> str:
         """Get Spotify API access token."""
         import base64
 
@@ -384,12 +806,16 @@ class SpotifyIngester(DatasetIngester):
 
         data = {'grant_type': 'client_credentials'}
 
-        response = requests.post(auth_url, headers=headers, data=data)
-        response.raise_for_status()
+        async with session.post(auth_url, headers=headers, data=data) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())['access_token']
 
-        return response.json()['access_token']
-
-    async def _search_tracks(self, access_token: str, num_tracks: int) -> List[Dict]:
+    async def _search_tracks(
+        self,
+        session: aiohttp.ClientSession,
+        access_token: str,
+        num_tracks: int
+    ) -> List[Dict]:
         """Search for tracks using various queries."""
         logger.info(f"Searching for {num_tracks} tracks...")
 
@@ -407,47 +833,92 @@ class SpotifyIngester(DatasetIngester):
             'genre:r&b year:2018-2024'
         ]
 
-        all_tracks = []
         tracks_per_query = num_tracks // len(search_queries)
 
-        for query in search_queries:
-            try:
-                offset = 0
-                gathered = 0
-
-                while gathered < tracks_per_query:
-                    search_url = f"https://api.spotify.com/v1/search"
-                    params = {
-                        'q': query,
-                        'type': 'track',
-                        'limit': min(50, tracks_per_query - gathered),
-                        'offset': offset
-                    }
+        # Queries and their pages are independent, so fetch them all
+        # concurrently on the shared session, within Spotify's rate limits
+        semaphore = asyncio.Semaphore(SPOTIFY_MAX_CONCURRENT_REQUESTS)
 
-                    response = requests.get(search_url, headers=headers, params=params)
-                    response.raise_for_status()
+        results = await asyncio.gather(*[
+            self._search_query(session, semaphore, headers, query, tracks_per_query)
+            for query in search_queries
+        ])
 
-                    data = response.json()
-                    tracks = data.get('tracks', {}).get('items', [])
+        all_tracks = [track for query_tracks in results for track in query_tracks]
 
-                    if not tracks:
-                        break
+        logger.info(f"Total tracks gathered: {len(all_tracks)}")
+        return all_tracks
 
-                    for track in tracks:
-                        track_data = self._process_spotify_track(track)
-                        if track_data:
-                            all_tracks.append(track_data)
-                            gathered += 1
+    async def _search_query(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        headers: Dict,
+        query: str,
+        num_tracks: int
+    ) -> List[Dict]:
+        """Gather up to num_tracks tracks for one search query, fetching all pages at once."""
+        # Every page is known up front, so clamp to what the API can return
+        # instead of issuing requests that would be rejected
+        if num_tracks > SPOTIFY_MAX_SEARCH_RESULTS:
+            logger.warning(
+                f"Spotify search returns at most {SPOTIFY_MAX_SEARCH_RESULTS} results per query; "
+                f"capping '{query}' from {num_tracks}"
+            )
+            num_tracks = SPOTIFY_MAX_SEARCH_RESULTS
+
+        offsets = range(0, num_tracks, SPOTIFY_PAGE_SIZE)
+
+        pages = await asyncio.gather(*[
+            self._search_page(
+                session, semaphore, headers, query, offset,
+                min(SPOTIFY_PAGE_SIZE, num_tracks - offset)
+            )
+            for offset in offsets
+        ])
+
+        query_tracks = [track for page in pages for track in page]
+
+        logger.info(f"Gathered {len(query_tracks)} tracks for query: {query}")
+        return query_tracks
+
+    async def _search_page(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        headers: Dict,
+        query: str,
+        offset: int,
+        limit: int
+    ) -> List[Dict]:
+        """Fetch and process one page of search results."""
+        search_url = "https://api.spotify.com/v1/search"
+        params = {
+            'q': query,
+            'type': 'track',
+            'limit': limit,
+            'offset': offset
+        }
 
-                    offset += len(tracks)
+        try:
+            async with semaphore:
+                async with session.get(search_url, headers=headers, params=params) as response:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
 
-                logger.info(f"Gathered {gathered} tracks for query: {query}")
+        except Exception as e:
+            logger.warning(f"Failed to search with query '{query}' (offset {offset}): {e}")
+            return []
 
-            except Exception as e:
-                logger.warning(f"Failed to search with query '{query}': {e}")
+        tracks = data.get('tracks', {}).get('items', [])
 
-        logger.info(f"Total tracks gathered: {len(all_tracks)}")
-        return all_tracks
+        page_tracks = []
+        for track in tracks:
+            track_data = self._process_spotify_track(track)
+            if track_data:
+                page_tracks.append(track_data)
+
+        return page_tracks
 
     def _process_spotify_track(self, track: Dict) -> Dict:
         """Process Spotify track data."""
@@ -466,70 +937,58 @@ class SpotifyIngester(DatasetIngester):
                 'external_urls': track.get('external_urls', {})
             }
         except Exception as e:
-            logger.debug(f"Failed to process Spotify track: {e}")
+            # Skip building the message when DEBUG is filtered out
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Failed to process Spotify track: {e}")
             return None
 
     async def _ingest_spotify_tracks(self, tracks_data: List[Dict]):
         """Ingest Spotify tracks to database."""
         logger.info("Ingesting Spotify tracks to database...")
 
-        conn = await get_db_connection()
+        pool = await get_db_pool(init=_init_json_codecs)
 
         try:
             # Get default organization
-            org_result = await conn.fetchrow("SELECT id FROM organizations LIMIT 1")
+            org_result = await pool.fetchrow("SELECT id FROM organizations LIMIT 1")
             if not org_result:
                 logger.error("No organization found. Please create an organization first.")
                 return
 
             org_id = org_result['id']
 
-            for track_data in tracks_data:
-                try:
-                    # Check if track already exists
-                    existing = await conn.fetchrow(
-                        "SELECT id FROM tracks WHERE title = $1 AND artist = $2",
-                        track_data['title'], track_data['artist']
-                    )
-
-                    if existing:
-                        logger.debug(f"Track already exists: {track_data['title']}")
-                        continue
-
-                    # Insert track
-                    await conn.execute("""
-                        INSERT INTO tracks (
-                            org_id, title, artist, album, duration_seconds,
-                            release_year, audio_url, extra_metadata
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    """,
-                        org_id,
-                        track_data['title'],
-                        track_data['artist'],
-                        track_data['album'],
-                        track_data['duration_seconds'],
-                        track_data['release_year'],
-                        track_data['preview_url'],
-                        {
-                            'source': track_data['source'],
-                            'external_id': track_data['external_id'],
-                            'popularity': track_data['popularity'],
-                            'explicit': track_data['explicit'],
-                            'external_urls': track_data['external_urls']
-                        }
-                    )
-
-                    self.ingested_tracks += 1
+            records = [
+                (
+                    org_id,
+                    track_data['title'],
+                    track_data['artist'],
+                    track_data['album'],
+                    track_data['duration_seconds'],
+                    track_data['release_year'],
+                    track_data['preview_url'],
+                    track_data['source'],
+                    track_data['external_id'],
+                    {
+                        'popularity': track_data['popularity'],
+                        'explicit': track_data['explicit'],
+                        'external_urls': track_data['external_urls']
+                    }
+                )
+                for track_data in tracks_data
+            ]
 
-                    if self.ingested_tracks % 50 == 0:
-                        logger.info(f"Ingested {self.ingested_tracks} Spotify tracks...")
+            if records:
+                self.ingested_tracks += await self._bulk_insert_tracks(
+                    pool,
+                    ['org_id', 'title', 'artist', 'album', 'duration_seconds',
+                     'release_year', 'audio_url', 'source', 'external_id', 'extra_metadata'],
+                    _aiter_chunks([records])
+                )
 
-                except Exception as e:
-                    logger.debug(f"Failed to ingest Spotify track {track_data['title']}: {e}")
-                    self.failed_tracks += 1
+            logger.info(f"Ingested {self.ingested_tracks} Spotify tracks...")
 
         finally:
-            await conn.close()
+            await pool.close()
 
 
 async def main():
@@ -545,6 +1004,11 @@ async def main():
         action='store_true',
         help='Extract audio features after ingestion'
     )
+    parser.add_argument(
+        '--bulk-mode',
+        action='store_true',
+        help='Drop secondary track indexes during the load and rebuild them afterwards'
+    )
 
     # FMA-specific arguments
     parser.add_argument(
@@ -571,11 +1035,17 @@ async def main():
 
     try:
         if args.dataset == 'fma':
-            ingester = FMAIngester(extract_features=args.extract_features)
+            ingester = FMAIngester(
+                extract_features=args.extract_features,
+                bulk_mode=args.bulk_mode
+            )
             result = await ingester.ingest(subset=args.subset, data_dir=args.data_dir)
 
         elif args.dataset == 'spotify':
-            ingester = SpotifyIngester(extract_features=args.extract_features)
+            ingester = SpotifyIngester(
+                extract_features=args.extract_features,
+                bulk_mode=args.bulk_mode
+            )
             result = await ingester.ingest(tracks=args.tracks)
 
         elif args.dataset == 'musicbrainz':
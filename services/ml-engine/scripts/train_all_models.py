@@ -21,21 +21,19 @@ import argparse
 import sys
 import os
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
 
+import numpy as np
+import pandas as pd
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
 from data.loaders import load_training_data, load_tracks, load_audio_features
-from training.trainers import (
-    CollaborativeFilterTrainer,
-    PopularityTrainer,
-    GenreBasedTrainer,
-    ContentBasedTrainer,
-    NeuralCFTrainer
-)
 from training.evaluators import ModelEvaluator
 
 
@@ -51,6 +49,28 @@ logging.basicConfig(
 
 logger = logging.getLogger("train_all_models")
 
+FREE_TIER_MODELS = {
+    'collaborative_filter': 'Collaborative Filtering (ALS)',
+    'popularity': 'Popularity Model',
+    'genre_based': 'Genre-Based Model',
+}
+
+_free_tier_state = None
+
+
+def _train_free_tier_model(model_name: str) -> Dict:
+    """Train one Free Tier model in a worker forked from the pipeline."""
+    from training.trainers import CollaborativeFilterTrainer, PopularityTrainer, GenreBasedTrainer
+
+    train_data, val_data, tracks, id_codes = _free_tier_state
+    config = Config.FREE_MODELS.get(model_name, {})
+
+    if model_name == 'collaborative_filter':
+        return CollaborativeFilterTrainer(config).train(train_data, val_data, id_codes)
+    if model_name == 'popularity':
+        return PopularityTrainer(config).train(train_data, val_data)
+    return GenreBasedTrainer(config).train(train_data, tracks, val_data)
+
 
 class TrainingPipeline:
     """Complete training pipeline for all ML models."""
@@ -132,9 +152,28 @@ class TrainingPipeline:
         if not self.audio_features:
             logger.warning("No audio features found! Content-based models will be skipped.")
 
+        # Columnar view of the training interactions, built once and shared
+        # by the data checks and tier trainers that aggregate over it
+        self.train_df = pd.DataFrame(self.train_data)
+
+        # Intern the UUIDs once: 'uid'/'tid' hold int32 codes and the
+        # category indexes map each code back to its id for saving
+        user_cat = self.train_df['user_id'].astype('category').cat
+        track_cat = self.train_df['track_id'].astype('category').cat
+        self.train_df['uid'] = user_cat.codes.astype('int32')
+        self.train_df['tid'] = track_cat.codes.astype('int32')
+        self.user_index = user_cat.categories
+        self.track_index = track_cat.categories
+        self.id_codes = (
+            self.train_df['uid'].to_numpy(),
+            self.train_df['tid'].to_numpy(),
+            self.user_index.tolist(),
+            self.track_index.tolist(),
+        )
+
         # Data quality checks
-        unique_users = len(set(i['user_id'] for i in self.train_data))
-        unique_tracks = len(set(i['track_id'] for i in self.train_data))
+        unique_users = len(self.user_index)
+        unique_tracks = len(self.track_index)
 
         logger.info(f"Data quality: {unique_users} unique users, {unique_tracks} unique tracks")
 
@@ -146,43 +185,43 @@ class TrainingPipeline:
 
     async def _train_free_tier(self):
         """Train all Free Tier models."""
+        global _free_tier_state
+
         logger.info("\n🆓 Training Free Tier Models")
         logger.info("-" * 40)
 
         free_results = {}
+        loop = asyncio.get_running_loop()
+
+        # The three models are independent and mostly pure Python, so train
+        # them in separate processes. Forked workers inherit the training
+        # data, so only the model name is sent to each of them.
+        _free_tier_state = (self.train_data, self.val_data, self.tracks, self.id_codes)
+        if 'fork' in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(
+                max_workers=len(FREE_TIER_MODELS),
+                mp_context=multiprocessing.get_context('fork')
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=len(FREE_TIER_MODELS))
 
-        # 1. Collaborative Filtering (ALS)
-        try:
-            logger.info("Training Collaborative Filtering (ALS)...")
-            cf_trainer = CollaborativeFilterTrainer(Config.FREE_MODELS.get('collaborative_filter', {}))
-            cf_results = cf_trainer.train(self.train_data, self.val_data)
-            free_results['collaborative_filter'] = cf_results
-            logger.info("✅ Collaborative Filtering training completed")
-        except Exception as e:
-            logger.error(f"❌ Collaborative Filtering training failed: {e}")
-            free_results['collaborative_filter'] = {'error': str(e)}
-
-        # 2. Popularity Model
-        try:
-            logger.info("Training Popularity Model...")
-            pop_trainer = PopularityTrainer(Config.FREE_MODELS.get('popularity', {}))
-            pop_results = pop_trainer.train(self.train_data, self.val_data)
-            free_results['popularity'] = pop_results
-            logger.info("✅ Popularity Model training completed")
-        except Exception as e:
-            logger.error(f"❌ Popularity Model training failed: {e}")
-            free_results['popularity'] = {'error': str(e)}
-
-        # 3. Genre-Based Model
         try:
-            logger.info("Training Genre-Based Model...")
-            genre_trainer = GenreBasedTrainer(Config.FREE_MODELS.get('genre_based', {}))
-            genre_results = genre_trainer.train(self.train_data, self.tracks, self.val_data)
-            free_results['genre_based'] = genre_results
-            logger.info("✅ Genre-Based Model training completed")
-        except Exception as e:
-            logger.error(f"❌ Genre-Based Model training failed: {e}")
-            free_results['genre_based'] = {'error': str(e)}
+            with executor:
+                futures = []
+                for model_name, label in FREE_TIER_MODELS.items():
+                    logger.info(f"Training {label}...")
+                    futures.append(loop.run_in_executor(executor, _train_free_tier_model, model_name))
+                results = await asyncio.gather(*futures, return_exceptions=True)
+        finally:
+            _free_tier_state = None
+
+        for (model_name, label), result in zip(FREE_TIER_MODELS.items(), results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {label} training failed: {result}")
+                free_results[model_name] = {'error': str(result)}
+            else:
+                free_results[model_name] = result
+                logger.info(f"✅ {label} training completed")
 
         self.training_results['free_tier'] = free_results
 
@@ -191,24 +230,38 @@ class TrainingPipeline:
         logger.info("\n🚀 Training Starter Tier Models")
         logger.info("-" * 40)
 
-        starter_results = {}
-
-        # 1. Content-Based Model (requires audio features)
-        if self.audio_features:
-            try:
-                logger.info("Training Content-Based Model...")
-                content_trainer = ContentBasedTrainer(Config.STARTER_MODELS.get('content_based', {}))
-                content_results = content_trainer.train(self.audio_features)
-                starter_results['content_based'] = content_results
-                logger.info("✅ Content-Based Model training completed")
-            except Exception as e:
-                logger.error(f"❌ Content-Based Model training failed: {e}")
-                starter_results['content_based'] = {'error': str(e)}
-        else:
+        # FAISS indexing and the daily mix fit are independent; run them side
+        # by side (FAISS releases the GIL while it builds the index)
+        content_results, daily_mix_results = await asyncio.gather(
+            asyncio.to_thread(self._train_content_based),
+            asyncio.to_thread(self._train_daily_mix),
+        )
+
+        self.training_results['starter_tier'] = {
+            'content_based': content_results,
+            'daily_mix': daily_mix_results,
+        }
+
+    def _train_content_based(self) -> Dict:
+        """Train the Content-Based model (requires audio features)."""
+        if not self.audio_features:
             logger.warning("⚠️ Skipping Content-Based Model (no audio features)")
-            starter_results['content_based'] = {'error': 'No audio features available'}
+            return {'error': 'No audio features available'}
+
+        try:
+            logger.info("Training Content-Based Model...")
+            from training.trainers import ContentBasedTrainer
+
+            content_trainer = ContentBasedTrainer(Config.STARTER_MODELS.get('content_based', {}))
+            content_results = content_trainer.train(self.audio_features)
+            logger.info("✅ Content-Based Model training completed")
+            return content_results
+        except Exception as e:
+            logger.error(f"❌ Content-Based Model training failed: {e}")
+            return {'error': str(e)}
 
-        # 2. Daily Mix Generator (requires genre data)
+    def _train_daily_mix(self) -> Dict:
+        """Train the Daily Mix Generator (requires genre data)."""
         try:
             logger.info("Training Daily Mix Generator...")
             from models.premium.daily_mix_generator import DailyMixGenerator
@@ -217,83 +270,96 @@ class TrainingPipeline:
             daily_mix.fit(self.train_data, self.tracks)
 
             # Save model
-            model_path = os.path.join(Config.MODEL_SAVE_PATH, "starter", "daily_mix.pkl")
+            model_path = os.path.join(Config.MODEL_SAVE_PATH, "starter", "daily_mix")
             os.makedirs(os.path.dirname(model_path), exist_ok=True)
             daily_mix.save(model_path)
 
-            starter_results['daily_mix'] = {
+            logger.info("✅ Daily Mix Generator training completed")
+            return {
                 'model_type': 'Daily Mix Generator',
                 'num_genres': len(daily_mix.genre_tracks),
-                'num_users_with_history': len(daily_mix.user_genre_history),
+                'num_users_with_history': len(daily_mix.user_top_genres),
                 'training_time': 'completed'
             }
-            logger.info("✅ Daily Mix Generator training completed")
 
         except Exception as e:
             logger.error(f"❌ Daily Mix Generator training failed: {e}")
-            starter_results['daily_mix'] = {'error': str(e)}
-
-        self.training_results['starter_tier'] = starter_results
+            return {'error': str(e)}
 
     async def _train_pro_tier(self):
         """Train all Pro Tier models."""
         logger.info("\n💎 Training Pro Tier Models")
         logger.info("-" * 40)
 
-        pro_results = {}
+        # Neural CF spends its time in torch kernels and its own DataLoader
+        # workers, so the taste profiles can be built alongside it
+        ncf_results, profiler_results = await asyncio.gather(
+            asyncio.to_thread(self._train_neural_cf),
+            asyncio.to_thread(self._train_taste_profiler),
+        )
+
+        self.training_results['pro_tier'] = {
+            'neural_cf': ncf_results,
+            'taste_profiler': profiler_results,
+        }
 
-        # 1. Neural Collaborative Filtering
+    def _train_neural_cf(self) -> Dict:
+        """Train the Neural Collaborative Filtering model."""
         try:
             logger.info("Training Neural Collaborative Filtering...")
+            from training.trainers import NeuralCFTrainer
+
             ncf_trainer = NeuralCFTrainer(Config.PRO_MODELS.get('neural_cf', {}))
-            ncf_results = ncf_trainer.train(self.train_data, self.val_data)
-            pro_results['neural_cf'] = ncf_results
+            ncf_results = ncf_trainer.train(self.train_data, self.val_data, self.id_codes)
             logger.info("✅ Neural CF training completed")
+            return ncf_results
         except Exception as e:
             logger.error(f"❌ Neural CF training failed: {e}")
-            pro_results['neural_cf'] = {'error': str(e)}
+            return {'error': str(e)}
 
-        # 2. Taste Profiler
+    def _train_taste_profiler(self) -> Dict:
+        """Build Taste Profiler profiles for a sample of users."""
         try:
             logger.info("Training Taste Profiler...")
             from models.enterprise.taste_profiler import TasteProfiler
 
             profiler = TasteProfiler()
 
-            # Build profiles for a sample of users (for demonstration)
-            sample_users = list(set(i['user_id'] for i in self.train_data))[:100]
-            profiles_built = 0
-
-            for user_id in sample_users:
-                try:
-                    user_interactions = [i for i in self.train_data if i['user_id'] == user_id]
-                    if len(user_interactions) >= 5:  # Minimum interactions for profile
-                        profile = profiler.build_profile(
-                            user_id, user_interactions, self.tracks,
-                            {f['track_id']: f for f in self.audio_features}
-                        )
-                        profiles_built += 1
-                except Exception as e:
-                    logger.debug(f"Failed to build profile for user {user_id}: {e}")
+            # Build profiles for a sample of users (for demonstration).
+            # One bincount over the int32 user codes counts every user's
+            # interactions; the profiler then indexes the interactions and
+            # audio features once and builds all eligible profiles from that
+            # columnar index. It stays in-process (max_workers=1) because
+            # Neural CF is training on another thread and forking now is unsafe.
+            interaction_counts = np.bincount(self.train_df['uid'].to_numpy(), minlength=len(self.user_index))
+            sample_users = self.user_index[:100].tolist()
+            eligible_users = [
+                user_id for code, user_id in enumerate(sample_users)
+                if interaction_counts[code] >= 5  # Minimum interactions for profile
+            ]
+            audio_features_by_track = {f['track_id']: f for f in self.audio_features}
+
+            profiles = profiler.build_profiles_bulk(
+                eligible_users, self.train_data, self.tracks, audio_features_by_track, max_workers=1
+            )
+            profiles_built = len(profiles)
 
             # Save model
-            model_path = os.path.join(Config.MODEL_SAVE_PATH, "pro", "taste_profiler.pkl")
+            model_path = os.path.join(Config.MODEL_SAVE_PATH, "pro", "taste_profiler.parquet")
             os.makedirs(os.path.dirname(model_path), exist_ok=True)
             profiler.save(model_path)
 
-            pro_results['taste_profiler'] = {
+            logger.info(f"✅ Taste Profiler training completed ({profiles_built} profiles)")
+            return {
                 'model_type': 'Taste Profiler',
                 'profiles_built': profiles_built,
                 'sample_users': len(sample_users),
                 'training_time': 'completed'
             }
-            logger.info(f"✅ Taste Profiler training completed ({profiles_built} profiles)")
 
         except Exception as e:
             logger.error(f"❌ Taste Profiler training failed: {e}")
-            pro_results['taste_profiler'] = {'error': str(e)}
-
-        self.training_results['pro_tier'] = pro_results
+            return {'error': str(e)}
 
     async def _run_evaluation(self):
         """Run comprehensive model evaluation."""
@@ -356,7 +422,7 @@ class TrainingPipeline:
     def _save_training_report(self):
         """Save training report to file."""
         try:
-            import json
+            import orjson
 
             report = {
                 'training_date': self.start_time.isoformat(),
@@ -377,8 +443,14 @@ class TrainingPipeline:
             report_path = os.path.join(Config.MODEL_SAVE_PATH, f"training_report_{self.start_time.strftime('%Y%m%d_%H%M%S')}.json")
             os.makedirs(os.path.dirname(report_path), exist_ok=True)
 
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            # orjson encodes datetimes, UUIDs and numpy values natively; str()
+            # is only the fallback for anything else, as before
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    report,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ))
 
             logger.info(f"📄 Training report saved to: {report_path}")
 
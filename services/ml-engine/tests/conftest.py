@@ -0,0 +1,7 @@
+"""Pytest configuration for TuneTrail ML engine tests."""
+
+import os
+import sys
+
+# Tests import modules the same way the scripts do, from the ml-engine root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("asyncpg")
+
+from utils.arrow_rows import ArrowRowMapping
+
+
+def _genres(rows):
+    return rows.column("genre").to_pylist()
+
+
+@pytest.fixture
+def users():
+    return [uuid4(), uuid4(), uuid4()]
+
+
+@pytest.fixture
+def mapping(users):
+    table = pa.table({
+        "user_id": [str(users[0]), str(users[0]), str(users[1]), str(users[2])],
+        "genre": ["rock", "jazz", "pop", None],
+    })
+    return ArrowRowMapping(table, "user_id", _genres, key_type=UUID)
+
+
+def test_values_are_decoded_from_contiguous_row_slices(mapping, users):
+    """Test each key maps to the slice of rows that share it."""
+    assert len(mapping) == 3
+    assert users[0] in mapping
+    assert uuid4() not in mapping
+    assert mapping[users[0]] == ["rock", "jazz"]
+    assert mapping[users[2]] == [None]
+    assert dict(mapping) == {users[0]: ["rock", "jazz"], users[1]: ["pop"], users[2]: [None]}
+
+
+def test_assigned_values_shadow_the_table(mapping, users):
+    """Test writes and deletes take precedence over the mapped rows."""
+    mapping[users[1]] = ["metal"]
+    del mapping[users[2]]
+    new_user = uuid4()
+    mapping[new_user] = []
+
+    assert len(mapping) == 3
+    assert users[2] not in mapping
+    assert mapping[users[1]] == ["metal"]
+    assert set(mapping) == {users[0], users[1], new_user}
+
+
+def test_empty_table():
+    """Test an empty table yields an empty mapping."""
+    table = pa.table({"user_id": pa.array([], type=pa.string())})
+    assert len(ArrowRowMapping(table, "user_id", _genres)) == 0
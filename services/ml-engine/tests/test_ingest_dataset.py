@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("aiohttp")
+pytest.importorskip("asyncpg")
+
+from scripts import ingest_dataset
+from scripts.ingest_dataset import FMAIngester
+
+# FMA's tracks.csv layout: a (section, field) two-level header followed by a
+# row holding only the index name
+TRACKS_CSV = """\
+,album,artist,track,track,track,track,track
+,title,name,duration,genre_top,interest,license,title
+track_id,,,,,,,
+2,AWOL - A Way Of Life,AWOL,168,Hip-Hop,4656,Attribution-NonCommercial,Food
+3,AWOL - A Way Of Life,AWOL,237,Hip-Hop,1470,,Electric Ave
+5,"Niris, Vol. 1",Kurt Vile,206,,1933,Attribution,This World
+"""
+
+
+@pytest.fixture
+def metadata_path(tmp_path):
+    (tmp_path / "tracks.csv").write_text(TRACKS_CSV, encoding="utf-8")
+    return tmp_path
+
+
+def test_process_fma_metadata_selects_columns_by_section_and_field(metadata_path):
+    """Test tracks.csv is parsed positionally from its multi-level header."""
+    chunks = list(FMAIngester()._process_fma_metadata(metadata_path))
+    records = [record for chunk in chunks for record in chunk]
+
+    assert records == [
+        {
+            'external_id': '2',
+            'title': 'Food',
+            'artist': 'AWOL',
+            'album': 'AWOL - A Way Of Life',
+            'genre': 'Hip-Hop',
+            'duration_seconds': '168',
+            'license': 'Attribution-NonCommercial',
+            'release_year': None,
+            'source': 'FMA',
+        },
+        {
+            'external_id': '3',
+            'title': 'Electric Ave',
+            'artist': 'AWOL',
+            'album': 'AWOL - A Way Of Life',
+            'genre': 'Hip-Hop',
+            'duration_seconds': '237',
+            'license': None,
+            'release_year': None,
+            'source': 'FMA',
+        },
+        {
+            'external_id': '5',
+            'title': 'This World',
+            'artist': 'Kurt Vile',
+            'album': 'Niris, Vol. 1',
+            'genre': None,
+            'duration_seconds': '206',
+            'license': 'Attribution',
+            'release_year': None,
+            'source': 'FMA',
+        },
+    ]
+
+
+def test_process_fma_metadata_streams_chunks(metadata_path, monkeypatch):
+    """Test tracks.csv is yielded one CSV_CHUNK_SIZE chunk at a time."""
+    monkeypatch.setattr(ingest_dataset, "CSV_CHUNK_SIZE", 2)
+
+    chunks = list(FMAIngester()._process_fma_metadata(metadata_path))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [record['external_id'] for record in chunks[1]] == ['5']
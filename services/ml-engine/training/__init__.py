@@ -1,7 +1,27 @@
-from .trainers import BaseTrainer, CollaborativeFilterTrainer, NeuralCFTrainer
-from .evaluators import ModelEvaluator
-from .schedulers import TrainingScheduler
-from .callbacks import ModelCheckpointCallback, EarlyStoppingCallback, MetricsLoggingCallback
+from importlib import import_module
+
+# trainers and callbacks pull in torch and pytorch_lightning; load each
+# submodule on first attribute access so that callers which only need the
+# scheduler (such as the API process dispatching jobs) do not pay for them
+_LAZY_EXPORTS = {
+    "BaseTrainer": ".trainers",
+    "CollaborativeFilterTrainer": ".trainers",
+    "NeuralCFTrainer": ".trainers",
+    "ModelEvaluator": ".evaluators",
+    "TrainingScheduler": ".schedulers",
+    "ModelCheckpointCallback": ".callbacks",
+    "EarlyStoppingCallback": ".callbacks",
+    "MetricsLoggingCallback": ".callbacks",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseTrainer",
@@ -1,11 +1,21 @@
 import os
+import numpy as np
 import torch
 import pytorch_lightning as pl
 from pytorch_lightning.callbacks import Callback
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+from itertools import chain
 import logging
+import threading
 from datetime import datetime
 import json
+import orjson
+
+try:
+    import pynvml
+except ImportError:  # Only needed for background GPU memory sampling
+    pynvml = None
 
 
 class ModelCheckpointCallback(Callback):
@@ -35,6 +45,11 @@ class ModelCheckpointCallback(Callback):
 
         self.logger = logging.getLogger(f"checkpoint.{tier}")
 
+        # Kept checkpoints as a heap of (key, path) whose root is the worst
+        # one; key is the score negated for mode="min" so that holds for both
+        self.best_checkpoints: List[Tuple[float, str]] = []
+        self.backup_checkpoints = set()
+
     def on_validation_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
         """Save checkpoint after validation."""
         if trainer.sanity_checking:
@@ -52,6 +67,10 @@ class ModelCheckpointCallback(Callback):
             if should_save:
                 checkpoint_path = self._get_checkpoint_path(current_epoch, current_score)
                 self._save_checkpoint(trainer, pl_module, checkpoint_path, metrics)
+                if current_epoch % 10 == 0:
+                    self.backup_checkpoints.add(checkpoint_path)
+                if self._is_top_k(current_score):
+                    self._track_checkpoint(current_score, checkpoint_path)
 
     def _should_save_checkpoint(self, current_score: float, epoch: int) -> bool:
         """Determine if checkpoint should be saved."""
@@ -59,9 +78,42 @@ class ModelCheckpointCallback(Callback):
         if epoch % 10 == 0:
             return True
 
-        # Save based on monitoring metric
-        # Implementation would track best scores
-        return True  # Simplified for now
+        # Otherwise only when the score makes it into the top k
+        return self._is_top_k(current_score)
+
+    def _heap_key(self, score: float) -> float:
+        return -score if self.mode == "min" else score
+
+    def _is_top_k(self, score: float) -> bool:
+        """Whether a checkpoint with this score belongs among the kept ones."""
+        if self.save_top_k < 0:
+            return True
+        if self.save_top_k == 0:
+            return False
+        if len(self.best_checkpoints) < self.save_top_k:
+            return True
+        return self._heap_key(score) > self.best_checkpoints[0][0]
+
+    def _track_checkpoint(self, score: float, path: str):
+        """Record a saved top-k checkpoint and delete the one it displaces."""
+        if self.save_top_k < 0:
+            return
+
+        entry = (self._heap_key(score), path)
+        if len(self.best_checkpoints) < self.save_top_k:
+            heapq.heappush(self.best_checkpoints, entry)
+            return
+
+        # The new checkpoint is already on disk, so the evicted one can go
+        _, evicted_path = heapq.heappushpop(self.best_checkpoints, entry)
+        if evicted_path in self.backup_checkpoints:
+            return
+        for stale in (evicted_path, evicted_path.replace('.ckpt', '_metadata.json')):
+            try:
+                os.unlink(stale)
+            except FileNotFoundError:
+                pass
+        self.logger.debug(f"Removed checkpoint outside top {self.save_top_k}: {evicted_path}")
 
     def _get_checkpoint_path(self, epoch: int, score: float) -> str:
         """Generate checkpoint file path."""
@@ -178,7 +230,28 @@ class MetricsLoggingCallback(Callback):
         self.log_every_n_epochs = log_every_n_epochs
 
         self.logger = logging.getLogger(f"metrics.{tier}")
-        self.metrics_history = []
+        # Columnar history: one list per metric, aligned with 'epoch'.
+        # A metric missing from an epoch is recorded as NaN.
+        self.metrics_history = {'epoch': [], 'timestamp': []}
+        self._history_fp = None
+        self._history_path = None
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        """Open the JSONL history file that epochs are appended to."""
+        try:
+            from config import Config
+
+            self._history_path = os.path.join(
+                Config.MODEL_SAVE_PATH,
+                self.tier,
+                f"training_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+            )
+            os.makedirs(os.path.dirname(self._history_path), exist_ok=True)
+            self._history_fp = open(self._history_path, 'ab', buffering=1 << 16)
+
+        except Exception as e:
+            self.logger.error(f"Failed to open training history: {e}")
+            self._history_fp = None
 
     def on_train_epoch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
         """Log training metrics at epoch end."""
@@ -188,36 +261,60 @@ class MetricsLoggingCallback(Callback):
         metrics = trainer.callback_metrics
         epoch = trainer.current_epoch
 
-        # Extract relevant metrics
-        train_metrics = {k: float(v) for k, v in metrics.items() if k.startswith('train_')}
-        val_metrics = {k: float(v) for k, v in metrics.items() if k.startswith('val_')}
+        # Extract relevant metrics. float() on each GPU tensor would block
+        # on a device->host copy per metric; stack them and copy once.
+        keys = [k for k in metrics if k.startswith(('train_', 'val_'))]
+        values = torch.stack([metrics[k].detach().float() for k in keys]).cpu().tolist() if keys else []
+        train_metrics = {k: v for k, v in zip(keys, values) if k.startswith('train_')}
+        val_metrics = {k: v for k, v in zip(keys, values) if k.startswith('val_')}
 
-        # Log epoch summary
-        self.logger.info(f"Epoch {epoch} Summary:")
-        for name, value in train_metrics.items():
-            self.logger.info(f"  {name}: {value:.6f}")
-        for name, value in val_metrics.items():
-            self.logger.info(f"  {name}: {value:.6f}")
+        # Log epoch summary as a single record
+        if self.logger.isEnabledFor(logging.INFO):
+            lines = [f"Epoch {epoch} Summary:"]
+            lines.extend(f"  {name}: {value:.6f}" for name, value in chain(train_metrics.items(), val_metrics.items()))
+            self.logger.info("\n".join(lines))
 
         # Track metrics history
-        epoch_metrics = {
-            'epoch': epoch,
-            'train_metrics': train_metrics,
-            'val_metrics': val_metrics,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.metrics_history.append(epoch_metrics)
+        epoch_metrics = {**train_metrics, **val_metrics}
+        self._record_epoch(epoch, epoch_metrics)
+        self._append_history(epoch, epoch_metrics)
 
         # Tier-specific insights
         self._log_tier_specific_insights(epoch, train_metrics, val_metrics)
 
+    def _record_epoch(self, epoch: int, epoch_metrics: Dict[str, float]):
+        """Append one epoch to the columnar metrics history."""
+        history = self.metrics_history
+        num_recorded = len(history['epoch'])
+
+        for name in epoch_metrics:
+            if name not in history:
+                history[name] = [float('nan')] * num_recorded
+
+        for name, column in history.items():
+            if name not in ('epoch', 'timestamp'):
+                column.append(epoch_metrics.get(name, float('nan')))
+        history['epoch'].append(epoch)
+        history['timestamp'].append(datetime.now().isoformat())
+
+    def _append_history(self, epoch: int, epoch_metrics: Dict[str, float]):
+        """Append one epoch as a JSON line so a crashed run keeps its history."""
+        if self._history_fp is None:
+            return
+
+        row = {'epoch': epoch, 'timestamp': self.metrics_history['timestamp'][-1], **epoch_metrics}
+        try:
+            self._history_fp.write(orjson.dumps(row) + b'\n')
+            self._history_fp.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to append training history: {e}")
+
     def _log_tier_specific_insights(self, epoch: int, train_metrics: Dict, val_metrics: Dict):
         """Log tier-specific training insights."""
         if self.tier == "free":
             # For free tier, focus on convergence speed
             if 'train_loss' in train_metrics and epoch > 5:
-                recent_losses = [m['train_metrics'].get('train_loss', 0)
-                               for m in self.metrics_history[-5:]]
+                recent_losses = self.metrics_history['train_loss'][-5:]
                 if len(recent_losses) == 5:
                     loss_trend = recent_losses[-1] - recent_losses[0]
                     if abs(loss_trend) < 0.001:
@@ -246,39 +343,35 @@ class MetricsLoggingCallback(Callback):
         self.logger.info("🏁 Training Complete!")
         self.logger.info(f"Total epochs: {total_epochs}")
 
-        if self.metrics_history:
+        if self.metrics_history['epoch']:
             # Find best metrics
-            best_train_loss = min(m['train_metrics'].get('train_loss', float('inf'))
-                                 for m in self.metrics_history)
-            best_val_loss = min(m['val_metrics'].get('val_loss', float('inf'))
-                               for m in self.metrics_history)
+            best_train_loss = self._best_value('train_loss')
+            best_val_loss = self._best_value('val_loss')
 
             self.logger.info(f"Best training loss: {best_train_loss:.6f}")
             self.logger.info(f"Best validation loss: {best_val_loss:.6f}")
 
-            # Save training history
-            self._save_training_history()
+        self._close_history()
 
-    def _save_training_history(self):
-        """Save complete training history to file."""
-        try:
-            from config import Config
+    def _best_value(self, name: str) -> float:
+        """Lowest recorded value of a metric, or inf if it was never logged."""
+        values = np.asarray(self.metrics_history.get(name, []), dtype=np.float64)
+        if values.size == 0 or np.isnan(values).all():
+            return float('inf')
+        return float(np.nanmin(values))
 
-            history_path = os.path.join(
-                Config.MODEL_SAVE_PATH,
-                self.tier,
-                f"training_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
-
-            os.makedirs(os.path.dirname(history_path), exist_ok=True)
-
-            with open(history_path, 'w') as f:
-                json.dump(self.metrics_history, f, indent=2)
+    def on_exception(self, trainer: pl.Trainer, pl_module: pl.LightningModule, exception: BaseException) -> None:
+        """Keep the epochs written so far if training dies."""
+        self._close_history()
 
-            self.logger.info(f"Training history saved to: {history_path}")
+    def _close_history(self):
+        """Close the JSONL history file."""
+        if self._history_fp is None:
+            return
 
-        except Exception as e:
-            self.logger.error(f"Failed to save training history: {e}")
+        self._history_fp.close()
+        self._history_fp = None
+        self.logger.info(f"Training history saved to: {self._history_path}")
 
 
 class LearningRateMonitorCallback(Callback):
@@ -298,13 +391,73 @@ class LearningRateMonitorCallback(Callback):
 
 
 class GPUMonitorCallback(Callback):
-    """Monitor GPU usage during training."""
+    """Monitor GPU usage during training.
 
-    def __init__(self, log_every_n_batches: int = 100):
+    Memory is sampled from NVML on a background thread so the training loop
+    never has to synchronize the CUDA stream just to read a counter. Without
+    pynvml it falls back to polling torch.cuda every log_every_n_batches.
+
+    NVML reports device-wide usage (every process on the GPU), so it is
+    checked against a fraction of the device's memory rather than the fixed
+    per-process threshold used for torch.cuda.
+    """
+
+    def __init__(
+        self,
+        log_every_n_batches: int = 100,
+        sample_interval: float = 5.0,
+        device_memory_warning_fraction: float = 0.9
+    ):
         super().__init__()
         self.log_every_n_batches = log_every_n_batches
+        self.sample_interval = sample_interval
+        self.device_memory_warning_fraction = device_memory_warning_fraction
         self.logger = logging.getLogger("gpu_monitor")
 
+        # (used_gb, total_gb) written by the sampler thread; a single
+        # attribute assignment, so readers never see a torn value.
+        self._last_sample: Optional[Tuple[float, float]] = None
+        self._stop_event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        """Start the NVML sampler thread."""
+        if pynvml is None or not torch.cuda.is_available():
+            return
+
+        device_index = pl_module.device.index
+        if device_index is None:
+            device_index = torch.cuda.current_device()
+
+        # NVML enumerates GPUs in PCI order and ignores CUDA_VISIBLE_DEVICES,
+        # so the CUDA ordinal is resolved to the device's UUID instead
+        device_uuid = f"GPU-{torch.cuda.get_device_properties(device_index).uuid}"
+
+        self._stop_event.clear()
+        self._sampler = threading.Thread(
+            target=self._poll, args=(device_uuid,), name="gpu-monitor", daemon=True
+        )
+        self._sampler.start()
+
+    def _poll(self, device_uuid: str):
+        """Sample device memory until training ends."""
+        try:
+            pynvml.nvmlInit()
+        except Exception as e:
+            self.logger.debug(f"Failed to initialize NVML: {e}")
+            return
+
+        try:
+            handle = pynvml.nvmlDeviceGetHandleByUUID(device_uuid)
+            while not self._stop_event.is_set():
+                info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                self._last_sample = (info.used / 1024**3, info.total / 1024**3)
+                self._stop_event.wait(self.sample_interval)
+        except Exception as e:
+            self.logger.debug(f"Failed to get GPU memory info: {e}")
+        finally:
+            pynvml.nvmlShutdown()
+
     def on_train_batch_end(
         self,
         trainer: pl.Trainer,
@@ -317,6 +470,21 @@ class GPUMonitorCallback(Callback):
         if batch_idx % self.log_every_n_batches != 0:
             return
 
+        if self._sampler is not None:
+            sample = self._last_sample
+            if sample is None:
+                return
+
+            used, total = sample
+            self.logger.debug(f"GPU Memory - Device used (all processes): {used:.2f}GB / {total:.2f}GB")
+
+            # Warn if the device is close to full
+            if used > self.device_memory_warning_fraction * total:
+                self.logger.warning(
+                    f"High GPU device memory usage (all processes): {used:.2f}GB of {total:.2f}GB"
+                )
+            return
+
         if torch.cuda.is_available():
             try:
                 allocated = torch.cuda.memory_allocated() / 1024**3  # GB
@@ -331,4 +499,21 @@ class GPUMonitorCallback(Callback):
                     self.logger.warning(f"High GPU memory usage: {allocated:.2f}GB")
 
             except Exception as e:
-                self.logger.debug(f"Failed to get GPU memory info: {e}")
\ No newline at end of file
+                self.logger.debug(f"Failed to get GPU memory info: {e}")
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        """Stop the NVML sampler thread."""
+        self._stop_sampler()
+
+    def on_exception(self, trainer: pl.Trainer, pl_module: pl.LightningModule, exception: BaseException) -> None:
+        """Stop the NVML sampler thread if training dies."""
+        self._stop_sampler()
+
+    def _stop_sampler(self):
+        """Signal the sampler thread to exit and wait for it."""
+        if self._sampler is None:
+            return
+
+        self._stop_event.set()
+        self._sampler.join(timeout=self.sample_interval)
+        self._sampler = None
@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader, Dataset
@@ -6,6 +7,7 @@ import pytorch_lightning as pl
 from typing import Dict, List, Optional, Tuple, Any
 from uuid import UUID
 from abc import ABC, abstractmethod
+from pydantic import BaseModel
 import logging
 from datetime import datetime
 
@@ -18,6 +20,9 @@ class BaseTrainer(ABC):
 
     def __init__(self, model_name: str, config: Dict = None):
         self.model_name = model_name
+        # Config.*_MODELS entries are pydantic models; trainers read plain dicts
+        if isinstance(config, BaseModel):
+            config = config.model_dump()
         self.config = config or {}
         self.logger = logging.getLogger(f"trainer.{model_name}")
         self.device = torch.device('cuda' if Config.ENABLE_GPU and torch.cuda.is_available() else 'cpu')
@@ -41,33 +46,48 @@ class BaseTrainer(ABC):
 class InteractionDataset(Dataset):
     """Dataset for user-track interactions."""
 
-    def __init__(self, interactions: List[Dict], user_map: Dict, track_map: Dict):
+    def __init__(
+        self,
+        interactions: List[Dict],
+        user_map: Dict,
+        track_map: Dict,
+        user_codes: Optional[np.ndarray] = None,
+        track_codes: Optional[np.ndarray] = None
+    ):
         self.interactions = interactions
         self.user_map = user_map
         self.track_map = track_map
 
+        # Interactions are kept as parallel int32/float32 columns. Callers
+        # that already interned the ids pass the codes in; otherwise they are
+        # looked up here, with -1 marking ids that have no mapping.
+        if user_codes is None or track_codes is None:
+            user_codes = np.fromiter(
+                (user_map.get(i['user_id'], -1) for i in interactions), dtype=np.int32, count=len(interactions)
+            )
+            track_codes = np.fromiter(
+                (track_map.get(i['track_id'], -1) for i in interactions), dtype=np.int32, count=len(interactions)
+            )
+        ratings = np.fromiter(
+            (1.0 if i['interaction_type'] == 'like' else 0.5 for i in interactions),
+            dtype=np.float32,
+            count=len(interactions)
+        )
+
         # Filter interactions that have valid mappings
-        self.valid_interactions = []
-        for interaction in interactions:
-            user_id = interaction['user_id']
-            track_id = interaction['track_id']
-            if user_id in user_map and track_id in track_map:
-                self.valid_interactions.append({
-                    'user_idx': user_map[user_id],
-                    'track_idx': track_map[track_id],
-                    'rating': 1.0 if interaction['interaction_type'] == 'like' else 0.5,
-                    'interaction_type': interaction['interaction_type']
-                })
+        valid = (user_codes >= 0) & (track_codes >= 0)
+        self.user_idx = np.asarray(user_codes, dtype=np.int32)[valid]
+        self.track_idx = np.asarray(track_codes, dtype=np.int32)[valid]
+        self.ratings = ratings[valid]
 
     def __len__(self):
-        return len(self.valid_interactions)
+        return len(self.ratings)
 
     def __getitem__(self, idx):
-        interaction = self.valid_interactions[idx]
         return {
-            'user_idx': torch.tensor(interaction['user_idx'], dtype=torch.long),
-            'track_idx': torch.tensor(interaction['track_idx'], dtype=torch.long),
-            'rating': torch.tensor(interaction['rating'], dtype=torch.float32)
+            'user_idx': torch.tensor(self.user_idx[idx], dtype=torch.long),
+            'track_idx': torch.tensor(self.track_idx[idx], dtype=torch.long),
+            'rating': torch.tensor(self.ratings[idx], dtype=torch.float32)
         }
 
 
@@ -77,11 +97,22 @@ class CollaborativeFilterTrainer(BaseTrainer):
     def __init__(self, config: Dict = None):
         super().__init__("collaborative_filter", config)
 
-    def prepare_data(self, interactions: List[Dict]) -> Tuple[Dict, Dict, InteractionDataset, InteractionDataset]:
-        """Prepare interaction data for training."""
-        # Create user and track mappings
-        unique_users = list(set(i['user_id'] for i in interactions))
-        unique_tracks = list(set(i['track_id'] for i in interactions))
+    def prepare_data(
+        self, interactions: List[Dict], id_codes: Optional[Tuple] = None
+    ) -> Tuple[Dict, Dict, InteractionDataset, InteractionDataset]:
+        """Prepare interaction data for training.
+
+        id_codes is an optional (user_codes, track_codes, user_ids, track_ids)
+        tuple of int32 codes aligned with interactions plus the ids each code
+        stands for, so the ids don't have to be hashed again here.
+        """
+        if id_codes is not None:
+            user_codes, track_codes, unique_users, unique_tracks = id_codes
+        else:
+            # Create user and track mappings
+            unique_users = list(set(i['user_id'] for i in interactions))
+            unique_tracks = list(set(i['track_id'] for i in interactions))
+            user_codes = track_codes = None
 
         user_map = {uid: idx for idx, uid in enumerate(unique_users)}
         track_map = {tid: idx for idx, tid in enumerate(unique_tracks)}
@@ -91,15 +122,23 @@ class CollaborativeFilterTrainer(BaseTrainer):
         train_interactions = interactions[:split_idx]
         val_interactions = interactions[split_idx:]
 
-        train_dataset = InteractionDataset(train_interactions, user_map, track_map)
-        val_dataset = InteractionDataset(val_interactions, user_map, track_map)
+        if user_codes is not None:
+            train_dataset = InteractionDataset(
+                train_interactions, user_map, track_map, user_codes[:split_idx], track_codes[:split_idx]
+            )
+            val_dataset = InteractionDataset(
+                val_interactions, user_map, track_map, user_codes[split_idx:], track_codes[split_idx:]
+            )
+        else:
+            train_dataset = InteractionDataset(train_interactions, user_map, track_map)
+            val_dataset = InteractionDataset(val_interactions, user_map, track_map)
 
         self.logger.info(f"Data prepared: {len(unique_users)} users, {len(unique_tracks)} tracks")
         self.logger.info(f"Train: {len(train_dataset)} interactions, Val: {len(val_dataset)} interactions")
 
         return user_map, track_map, train_dataset, val_dataset
 
-    def train_als_model(self, interactions: List[Dict]) -> Dict:
+    def train_als_model(self, interactions: List[Dict], id_codes: Optional[Tuple] = None) -> Dict:
         """Train ALS collaborative filtering model."""
         from models.base.collaborative_filter import ALSCollaborativeFilter
 
@@ -108,11 +147,16 @@ class CollaborativeFilterTrainer(BaseTrainer):
         model = ALSCollaborativeFilter(
             factors=self.config.get('embedding_dim', 64),
             regularization=self.config.get('regularization', 0.01),
-            iterations=self.config.get('iterations', 15)
+            iterations=self.config.get('iterations', 15),
+            backend=self.config.get('backend', 'svd'),
+            use_cg=self.config.get('use_cg', True),
+            use_native=self.config.get('use_native', True),
+            use_gpu=self.config.get('use_gpu', False),
+            num_threads=self.config.get('num_threads', 0)
         )
 
         # Train the model
-        model.fit(interactions)
+        model.fit(interactions, id_codes=id_codes)
 
         # Save model
         model_path = os.path.join(Config.MODEL_SAVE_PATH, "free", "collaborative_filter_als.pkl")
@@ -120,9 +164,10 @@ class CollaborativeFilterTrainer(BaseTrainer):
         model.save(model_path)
 
         # Evaluate model (simple validation)
-        num_users = len(set(i['user_id'] for i in interactions))
+        num_users = len(model.user_id_map)
         metrics = {
             'model_type': 'ALS',
+            'backend': model.backend,
             'num_users': num_users,
             'num_interactions': len(interactions),
             'factors': model.factors,
@@ -132,9 +177,9 @@ class CollaborativeFilterTrainer(BaseTrainer):
         self.log_metrics(metrics)
         return metrics
 
-    def train(self, train_data: List[Dict], val_data: List[Dict] = None) -> Dict:
+    def train(self, train_data: List[Dict], val_data: List[Dict] = None, id_codes: Optional[Tuple] = None) -> Dict:
         """Train collaborative filtering model."""
-        return self.train_als_model(train_data)
+        return self.train_als_model(train_data, id_codes)
 
     def save_model(self, path: str):
         """ALS model is saved during training."""
@@ -215,13 +260,13 @@ class NeuralCFTrainer(BaseTrainer):
     def __init__(self, config: Dict = None):
         super().__init__("neural_cf", config)
 
-    def train(self, train_data: List[Dict], val_data: List[Dict] = None) -> Dict:
+    def train(self, train_data: List[Dict], val_data: List[Dict] = None, id_codes: Optional[Tuple] = None) -> Dict:
         """Train Neural CF model using PyTorch Lightning."""
         self.logger.info("Training Neural Collaborative Filtering...")
 
         # Prepare data
         cf_trainer = CollaborativeFilterTrainer()
-        user_map, track_map, train_dataset, val_dataset = cf_trainer.prepare_data(train_data)
+        user_map, track_map, train_dataset, val_dataset = cf_trainer.prepare_data(train_data, id_codes)
 
         # Create data loaders
         train_loader = DataLoader(
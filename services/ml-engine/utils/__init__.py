@@ -1,10 +1,36 @@
-from .db import get_db_connection, fetch_interactions, fetch_tracks, fetch_audio_features
-from .redis_client import get_redis_client, cache_recommendations, get_cached_recommendations
-from .similarity import build_faiss_index, search_similar_tracks
-from .metrics import compute_recall_at_k, compute_ndcg, compute_mrr
+from importlib import import_module
+
+from .db import get_db_connection, get_db_pool, fetch_interactions, fetch_tracks, fetch_audio_features
+
+# redis_client pulls in redis, similarity faiss and metrics numpy; load them
+# on first attribute access so that importing a light submodule such as
+# utils.db does not pay for (or require) any of them
+_LAZY_EXPORTS = {
+    "get_redis_client": ".redis_client",
+    "cache_recommendations": ".redis_client",
+    "get_cached_recommendations": ".redis_client",
+    "build_faiss_index": ".similarity",
+    "load_faiss_index": ".similarity",
+    "load_track_id_mapping": ".similarity",
+    "track_id_at": ".similarity",
+    "search_similar_tracks": ".similarity",
+    "compute_recall_at_k": ".metrics",
+    "compute_ndcg": ".metrics",
+    "compute_mrr": ".metrics",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "get_db_connection",
+    "get_db_pool",
     "fetch_interactions",
     "fetch_tracks",
     "fetch_audio_features",
@@ -12,8 +38,11 @@ __all__ = [
     "cache_recommendations",
     "get_cached_recommendations",
     "build_faiss_index",
+    "load_faiss_index",
+    "load_track_id_mapping",
+    "track_id_at",
     "search_similar_tracks",
     "compute_recall_at_k",
     "compute_ndcg",
     "compute_mrr",
-]
\ No newline at end of file
+]
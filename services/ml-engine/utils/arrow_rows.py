@@ -0,0 +1,70 @@
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class ArrowRowMapping(MutableMapping):
+    """Dict-like view over an Arrow table grouped by a string key column.
+
+    Rows sharing a key must be contiguous, as written by the models' save
+    methods. Only the key column is read up front to build a key -> row range
+    index; a value is decoded from its ``table.slice`` the first time it is
+    requested and cached. Values assigned after load shadow the table.
+    """
+
+    def __init__(
+        self,
+        table: pa.Table,
+        key_column: str,
+        decode: Callable[[pa.Table], Any],
+        key_type: Callable[[str], Hashable] = str,
+    ):
+        self._table = table
+        self._decode = decode
+        self._key_type = key_type
+        self._rows = self._build_row_index(table.column(key_column))
+        self._values: Dict[Hashable, Any] = {}
+
+    @staticmethod
+    def _build_row_index(keys: pa.ChunkedArray) -> Dict[str, Tuple[int, int]]:
+        keys = keys.combine_chunks()
+        n = len(keys)
+        if n == 0:
+            return {}
+
+        changed = pc.not_equal(keys[1:], keys[:-1]).to_numpy(zero_copy_only=False)
+        starts = np.flatnonzero(np.concatenate(([True], changed)))
+        lengths = np.diff(np.append(starts, n))
+        return dict(zip(keys.take(starts).to_pylist(), zip(starts.tolist(), lengths.tolist())))
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+
+        start, length = self._rows.pop(str(key))
+        value = self._values[key] = self._decode(self._table.slice(start, length))
+        return value
+
+    def __setitem__(self, key, value):
+        self._rows.pop(str(key), None)
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        if key in self._values:
+            del self._values[key]
+        else:
+            del self._rows[str(key)]
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or str(key) in self._rows
+
+    def __iter__(self) -> Iterator:
+        yield from list(self._values)
+        for key in list(self._rows):
+            yield self._key_type(key)
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._rows)
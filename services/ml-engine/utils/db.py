@@ -8,6 +8,12 @@ async def get_db_connection():
     return await asyncpg.connect(Config.DATABASE_URL)
 
 
+async def get_db_pool(min_size: int = 4, max_size: int = 16, **kwargs) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        Config.DATABASE_URL, min_size=min_size, max_size=max_size, **kwargs
+    )
+
+
 async def fetch_interactions(
     conn: asyncpg.Connection,
     user_id: Optional[UUID] = None,
@@ -119,4 +119,33 @@ def get_cached_taste_profile(
             profile['user_id'] = UUID(profile['user_id'])
         return profile
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cache_readiness(
+    redis_client: redis.Redis,
+    fingerprint: str,
+    readiness: Dict,
+    ttl: int = None
+):
+    if ttl is None:
+        ttl = Config.READINESS_CACHE_TTL
+
+    key = f"readiness:{fingerprint}"
+
+    serialized = json.dumps(readiness, default=str)
+    redis_client.setex(key, ttl, serialized)
+
+
+def get_cached_readiness(
+    redis_client: redis.Redis,
+    fingerprint: str
+) -> Optional[Dict]:
+    key = f"readiness:{fingerprint}"
+
+    cached = redis_client.get(key)
+
+    if cached:
+        return json.loads(cached)
+
+    return None
@@ -36,6 +36,20 @@ def build_faiss_index(
     return index
 
 
+def load_faiss_index(index_path: str, mmap: bool = True) -> faiss.Index:
+    io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+
+    return faiss.read_index(index_path, io_flags)
+
+
+def load_track_id_mapping(mapping_path: str) -> np.ndarray:
+    return np.load(mapping_path, mmap_mode='r')
+
+
+def track_id_at(mapping: np.ndarray, idx: int) -> UUID:
+    return UUID(bytes=bytes(mapping[idx]))
+
+
 def search_similar_tracks(
     index: faiss.Index,
     query_embedding: np.ndarray,